@@ -1,17 +1,66 @@
 import os
 import json
-import sys
+import logging
+import queue
 import asyncio
 import datetime
-from typing import Optional, List, AsyncGenerator
-from fastapi import FastAPI
+import functools
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Annotated, Optional, List, AsyncGenerator, AsyncIterable
+import httpx
+from fastapi import Body, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from openai import OpenAI, AsyncOpenAI
+from fastapi.responses import Response
+from fastapi.sse import EventSourceResponse, ServerSentEvent
+from pydantic import BaseModel, TypeAdapter
+from openai import AsyncOpenAI
 import re
 
-app = FastAPI(title="NPC Chatbot Backend", version="1.0.0")
+# Handlers only enqueue records; a background listener thread does the writing,
+# so request handlers never block on stderr. Set LOG_LEVEL=DEBUG for tool tracing.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+
+logger = logging.getLogger("npc_backend")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# Outbound HTTP settings, built once. The short pool timeout makes a saturated
+# pool fail fast instead of queueing requests behind it. HTTP/2 multiplexes
+# concurrent NPC streams over a few connections instead of one socket each.
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0, write=10.0, pool=2.0)
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# /chat/batch accepts at most this many conversations and runs this many at once,
+# so one request can't flood the pool and trip the pool timeout for everyone else
+MAX_CHAT_BATCH_SIZE = 16
+CHAT_BATCH_CONCURRENCY = 4
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create one pooled HTTP client for all outbound calls and close it on shutdown."""
+    _log_listener.start()
+    try:
+        app.state.http_client = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        try:
+            app.state.async_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=app.state.http_client,
+            )
+            yield
+        finally:
+            # Closes the pool AsyncOpenAI was built on as well
+            await app.state.http_client.aclose()
+    finally:
+        _log_listener.stop()
+
+
+app = FastAPI(title="NPC Chatbot Backend", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for Flutter app
 app.add_middleware(
@@ -22,10 +71,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# OpenAI clients
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 
 class ToolCallFunction(BaseModel):
     name: str
@@ -61,11 +106,17 @@ class ChatRequest(BaseModel):
     messages: list[ChatMessage]
     tools: list[Tool]
     npc_id: str
+    conversation_id: Optional[str] = None  # Client-generated, one per conversation
 
 class ChatResponse(BaseModel):
     role: str = "assistant"
     content: str
     tool_calls: Optional[list[ToolCall]] = None
+    error: Optional[str] = None  # Set instead of content when this conversation failed
+
+# Serializes responses we built ourselves without re-validating them
+_chat_responses_adapter = TypeAdapter(list[ChatResponse])
+_chat_messages_adapter = TypeAdapter(list[ChatMessage])
 
 @app.get("/")
 async def root():
@@ -127,63 +178,111 @@ GRAMMAR_MAPPING = {
     "ES_SIMPLE_REPLACE": "grammar_basic_greetings",
 }
 
-def extract_vocab_from_text(text: str) -> List[str]:
-    """Extract vocabulary skill IDs from text"""
-    text_lower = text.lower()
+# Pragmatic skill ID -> words and phrases that demonstrate it
+SKILL_KEYWORDS = {
+    "pragmatic_greetings_basic": ["hola", "buenos días", "buenas tardes", "buenas noches"],
+    "pragmatic_farewells_basic": ["adiós", "adios", "hasta luego", "chao"],
+    "pragmatic_courtesy_basic": ["por favor", "gracias", "de nada", "perdón", "disculpa"],
+    "pragmatic_basic_responses": ["sí", "si", "no", "claro", "vale", "ok"],
+}
+
+# Built once at import: single words are matched against the token set,
+# multi-word phrases with one compiled alternation
+_WORD_RE = re.compile(r'\w+')
+_SKILL_WORDS = {
+    word: skill_id
+    for skill_id, words in SKILL_KEYWORDS.items()
+    for word in words if " " not in word
+}
+_SKILL_PHRASES = {
+    phrase: skill_id
+    for skill_id, phrases in SKILL_KEYWORDS.items()
+    for phrase in phrases if " " in phrase
+}
+_PHRASE_RE = re.compile(r'\b(?:' + "|".join(map(re.escape, _SKILL_PHRASES)) + r')\b')
+
+def _tokenize(text_lower: str) -> set:
     # Split into words, remove punctuation
-    words = re.findall(r'\b\w+\b', text_lower)
+    return set(_WORD_RE.findall(text_lower))
 
-    skill_ids = set()
-    for word in words:
-        if word in VOCAB_MAPPING:
-            skill_ids.add(VOCAB_MAPPING[word])
+def _vocab_skills(words: set) -> set:
+    return {VOCAB_MAPPING[word] for word in words & VOCAB_MAPPING.keys()}
 
-    return list(skill_ids)
+def _pragmatic_skills(text_lower: str, words: set) -> set:
+    skill_ids = {_SKILL_WORDS[word] for word in words & _SKILL_WORDS.keys()}
+    skill_ids.update(_SKILL_PHRASES[phrase] for phrase in _PHRASE_RE.findall(text_lower))
+    return skill_ids
+
+def extract_vocab_from_text(text: str) -> List[str]:
+    """Extract vocabulary skill IDs from text"""
+    return list(_vocab_skills(_tokenize(text.lower())))
+
+_GRAMMAR_KEYS = frozenset(GRAMMAR_MAPPING)
+_GRAMMAR_SKILL_COUNT = len(set(GRAMMAR_MAPPING.values()))
 
 def extract_grammar_patterns(matches: list) -> List[str]:
     """Extract grammar pattern skill IDs from LanguageTool matches"""
-    skill_ids = set()
+    # If no errors, user demonstrated basic grammar skills
+    if not matches:
+        return ["grammar_basic_greetings"]
 
+    skill_ids = set()
     for match in matches:
-        rule = match.get("rule", {})
-        rule_id = rule.get("id", "")
+        rule_id = match.get("rule", {}).get("id", "")
 
         # Map rule IDs to skill IDs
-        if rule_id in GRAMMAR_MAPPING:
+        if rule_id in _GRAMMAR_KEYS:
             skill_ids.add(GRAMMAR_MAPPING[rule_id])
-
-    # If no errors, user demonstrated basic grammar skills
-    if not matches:
-        skill_ids.add("grammar_basic_greetings")
+            # Every mapped skill already found; later matches can't add any
+            if len(skill_ids) == _GRAMMAR_SKILL_COUNT:
+                break
 
     return list(skill_ids)
 
 def detect_skill_demonstrations(text: str, matches: list) -> List[str]:
     """Detect pragmatic skills demonstrated"""
     text_lower = text.lower()
-    skill_ids = set()
+    return list(_pragmatic_skills(text_lower, _tokenize(text_lower)))
 
-    # Greeting detection
-    greeting_words = ["hola", "buenos días", "buenas tardes", "buenas noches"]
-    if any(word in text_lower for word in greeting_words):
-        skill_ids.add("pragmatic_greetings_basic")
+_dummy_tool_content = "Tool {} executed successfully.".format
 
-    # Farewell detection
-    farewell_words = ["adiós", "adios", "hasta luego", "chao"]
-    if any(word in text_lower for word in farewell_words):
-        skill_ids.add("pragmatic_farewells_basic")
+def _dummy_tool_response(tool_call_id: str, name: str) -> dict:
+    return {
+        "role": "tool",
+        "tool_call_id": tool_call_id,
+        "content": _dummy_tool_content(name)
+    }
 
-    # Courtesy detection
-    courtesy_words = ["por favor", "gracias", "de nada", "perdón", "disculpa"]
-    if any(word in text_lower for word in courtesy_words):
-        skill_ids.add("pragmatic_courtesy_basic")
+def _scan_tool_history(messages: list, fixed_messages: list, pending: dict) -> None:
+    """
+    Append messages to fixed_messages, inserting dummy responses for unanswered tool calls.
+    pending maps tool_call_id -> function name for calls still open, so a scan can resume.
+    """
+    for msg in messages:
+        # Converted messages always carry a role
+        role = msg["role"]
 
-    # Basic responses
-    response_words = ["sí", "si", "no", "claro", "vale", "ok"]
-    if any(word in text_lower for word in response_words):
-        skill_ids.add("pragmatic_basic_responses")
+        if role == "assistant" and msg.get("tool_calls"):
+            # Track pending tool calls
+            pending.update((tc["id"], tc["function"]["name"]) for tc in msg["tool_calls"])
 
-    return list(skill_ids)
+        elif role == "tool":
+            # This is a tool response - remove from pending
+            pending.pop(msg.get("tool_call_id"), None)
+
+        elif pending:
+            # Before adding a non-tool message after tool_calls, add dummy responses
+            # for any unanswered tool calls
+            fixed_messages.extend(_dummy_tool_response(tc_id, name) for tc_id, name in pending.items())
+            pending.clear()
+
+        fixed_messages.append(msg)
+
+def _close_pending(pending: dict) -> list:
+    """Dummy responses for tool calls still open at the end of the history."""
+    for tc_id, name in pending.items():
+        logger.debug("used tools: %s: %s", tc_id, name)
+    return [_dummy_tool_response(tc_id, name) for tc_id, name in pending.items()]
 
 def validate_and_fix_messages(messages: list) -> list:
     """
@@ -191,162 +290,174 @@ def validate_and_fix_messages(messages: list) -> list:
     OpenAI requires that every tool_call has a corresponding tool response message.
     """
     fixed_messages = []
-    pending_tool_calls = {}  # id -> tool_call info
+    pending = {}
+    _scan_tool_history(messages, fixed_messages, pending)
+    return fixed_messages + _close_pending(pending)
+
+def convert_messages(messages: list[ChatMessage]) -> list[dict]:
+    """Convert request messages to OpenAI chat format."""
+    openai_messages = _chat_messages_adapter.dump_python(messages, exclude_none=True)
+    for message_dict in openai_messages:
+        # OpenAI wants a string here, and rejects empty tool fields
+        message_dict.setdefault("content", "")
+        if not message_dict.get("tool_call_id", True):
+            del message_dict["tool_call_id"]
+        if not message_dict.get("tool_calls", True):
+            del message_dict["tool_calls"]
+    return openai_messages
+
+# (npc_id, conversation_id) -> (fingerprints, fixed messages, open tool calls) of the
+# last history seen for that conversation. Histories only grow during a conversation,
+# so usually only the tail needs converting and validating.
+_prepared_histories: dict[tuple[str, str], tuple[list[tuple], list[dict], dict[str, str]]] = {}
+_MAX_PREPARED_HISTORIES = 1024
+
+def _message_fingerprint(msg: ChatMessage) -> tuple:
+    tool_calls = (
+        tuple((tc.id, tc.type, tc.function.name, tc.function.arguments) for tc in msg.tool_calls)
+        if msg.tool_calls else None
+    )
+    return (msg.role, msg.content, msg.tool_call_id, tool_calls)
 
-    for msg in messages:
-        role = msg.get("role", "")
+def prepare_history(npc_id: str, conversation_id: Optional[str], messages: list[ChatMessage]) -> list[dict]:
+    """
+    Convert messages to OpenAI format and fix the tool-call history, resuming from the
+    previous turn's result when the conversation's history still starts with the same
+    messages. Without a conversation_id the whole history is converted every time.
+    Returned dicts are shared.
+    """
+    if conversation_id is None:
+        return validate_and_fix_messages(convert_messages(messages))
+
+    key = (npc_id, conversation_id)
+    fingerprints = [_message_fingerprint(msg) for msg in messages]
+
+    cached = _prepared_histories.pop(key, None)
+    if cached is not None and fingerprints[:len(cached[0])] == cached[0]:
+        cached_fingerprints, fixed_messages, pending = cached
+        prefix_len = len(cached_fingerprints)
+    else:
+        fixed_messages, pending, prefix_len = [], {}, 0
+
+    # The cache entry was popped, so its lists can be extended in place
+    _scan_tool_history(convert_messages(messages[prefix_len:]), fixed_messages, pending)
+
+    if len(_prepared_histories) >= _MAX_PREPARED_HISTORIES:
+        # Drop the least recently used conversation
+        del _prepared_histories[next(iter(_prepared_histories))]
+    _prepared_histories[key] = (fingerprints, fixed_messages, pending)
+    return fixed_messages + _close_pending(pending)
+
+def _tools_key(tools: list[Tool], available_quest_ids: Optional[List[str]]) -> tuple:
+    """Hashable fingerprint of a tool catalog plus the quest IDs it is constrained to."""
+    return (
+        tuple(
+            (
+                tool.type,
+                tool.function.name,
+                tool.function.description,
+                json.dumps(tool.function.parameters),
+            )
+            for tool in tools
+        ),
+        tuple(available_quest_ids or ()),
+    )
 
-        if role == "assistant" and msg.get("tool_calls"):
-            # Track pending tool calls
-            for tc in msg["tool_calls"]:
-                pending_tool_calls[tc["id"]] = tc
-            fixed_messages.append(msg)
+@functools.lru_cache(maxsize=256)
+def _convert_tools_cached(key: tuple) -> list[dict]:
+    tool_specs, available_quest_ids = key
+    openai_tools = []
+    for tool_type, name, description, parameters_json in tool_specs:
+        tool_def = {
+            "type": tool_type,
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": json.loads(parameters_json),  # Fresh copy
+            }
+        }
 
-        elif role == "tool":
-            # This is a tool response - remove from pending
-            tool_call_id = msg.get("tool_call_id")
-            if tool_call_id in pending_tool_calls:
-                del pending_tool_calls[tool_call_id]
-            fixed_messages.append(msg)
-
-        else:
-            # Before adding a non-tool message after tool_calls, ensure all are responded to
-            if pending_tool_calls:
-                # Add dummy responses for any unanswered tool calls
-                for tc_id, tc in pending_tool_calls.items():
-                    fixed_messages.append({
-                        "role": "tool",
-                        "tool_call_id": tc_id,
-                        "content": f"Tool {tc['function']['name']} executed successfully."
-                    })
-                pending_tool_calls.clear()
-            fixed_messages.append(msg)
-
-    # Handle any remaining pending tool calls at the end
-    if pending_tool_calls:
-        for tc_id, tc in pending_tool_calls.items():
-            print(f"used tools: {tc_id}: {tc}")
-            fixed_messages.append({
-                "role": "tool",
-                "tool_call_id": tc_id,
-                "content": f"Tool {tc['function']['name']} executed successfully."
-            })
-
-    return fixed_messages
+        # For offer_quest tool, enforce quest_id enum if available_quest_ids provided
+        if name == "offer_quest" and available_quest_ids:
+            params = tool_def["function"]["parameters"]
+            if "properties" in params and "quest_id" in params["properties"]:
+                params["properties"]["quest_id"]["enum"] = list(available_quest_ids)
+                logger.debug("[TOOL_DEBUG] Added quest_id enum constraint: %s", list(available_quest_ids))
+
+        openai_tools.append(tool_def)
+    return openai_tools
+
+def convert_tools(tools: list[Tool], available_quest_ids: Optional[List[str]] = None) -> list[dict]:
+    """
+    Convert request tools to OpenAI format, adding enum constraints where needed.
+    Results are cached per tool catalog, so callers must not mutate them.
+    """
+    return _convert_tools_cached(_tools_key(tools, available_quest_ids))
 
 class StreamChatRequest(BaseModel):
     messages: list[ChatMessage]
     tools: list[Tool]
     npc_id: str
+    conversation_id: Optional[str] = None  # Client-generated, one per conversation
     message_count: int = 0  # Track conversation turn count for guardrails
     available_quest_ids: Optional[List[str]] = None  # Valid quest IDs for offer_quest tool
 
 
-async def generate_stream(request: StreamChatRequest) -> AsyncGenerator[str, None]:
-    sys.stdout.flush()
-
-    # Send an SSE comment immediately to establish the stream and prevent buffering
-    yield ": stream-start\n\n"
-    await asyncio.sleep(0)  # Force flush
-
+async def generate_stream(request: StreamChatRequest, async_client: AsyncOpenAI) -> AsyncGenerator[dict, None]:
+    """Yield SSE payloads: content deltas, then one final message (or an error)."""
     try:
-        # Convert messages to OpenAI format
-        openai_messages = []
-        for msg in request.messages:
-            message_dict = {
-                "role": msg.role,
-                "content": msg.content or "",
-            }
-            if msg.tool_call_id:
-                message_dict["tool_call_id"] = msg.tool_call_id
-            if msg.tool_calls:
-                message_dict["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": tc.type,
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        }
-                    }
-                    for tc in msg.tool_calls
-                ]
-            openai_messages.append(message_dict)
-
-        # Validate and fix message history
-        openai_messages = validate_and_fix_messages(openai_messages)
-
-        # Convert tools to OpenAI format, adding enum constraints where needed
-        openai_tools = []
-        for tool in request.tools:
-            tool_def = {
-                "type": tool.type,
-                "function": {
-                    "name": tool.function.name,
-                    "description": tool.function.description,
-                    "parameters": dict(tool.function.parameters),  # Make a copy
-                }
-            }
-
-            # For offer_quest tool, enforce quest_id enum if available_quest_ids provided
-            if tool.function.name == "offer_quest" and request.available_quest_ids:
-                params = tool_def["function"]["parameters"]
-                if "properties" in params and "quest_id" in params["properties"]:
-                    params["properties"]["quest_id"]["enum"] = request.available_quest_ids
-                    print(f"[TOOL_DEBUG] Added quest_id enum constraint: {request.available_quest_ids}")
-
-            openai_tools.append(tool_def)
+        # Convert messages to OpenAI format and fix the tool-call history
+        openai_messages = prepare_history(request.npc_id, request.conversation_id, request.messages)
 
         # Apply guardrails: Only allow tool calls after initial exchange
         # message_count: 0 = NPC opening, 1 = user first message, 2+ = can use tools
         allow_tools = request.message_count >= 2
-        print(f"[TOOL_DEBUG] NPC={request.npc_id} message_count={request.message_count} allow_tools={allow_tools} num_tools={len(openai_tools)}")
-        sys.stdout.flush()
+
+        # Convert tools to OpenAI format only when the model may call them
+        openai_tools = None
+        if allow_tools and request.tools:
+            openai_tools = convert_tools(request.tools, request.available_quest_ids)
+        logger.debug(
+            "[TOOL_DEBUG] NPC=%s message_count=%s allow_tools=%s num_tools=%s",
+            request.npc_id, request.message_count, allow_tools, len(request.tools),
+        )
 
         # Create streaming response using async client
-        sys.stdout.flush()
         stream = await async_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=openai_messages,
-            tools=openai_tools if openai_tools and allow_tools else None,
-            tool_choice="auto" if openai_tools and allow_tools else None,
+            tools=openai_tools,
+            tool_choice="auto" if openai_tools else None,
             stream=True,
         )
-        sys.stdout.flush()
 
-        collected_content = ""
-        collected_tool_calls = []
-        current_tool_call = None
-        chunk_count = 0
+        content_parts = []
+        # index -> tool call already in the OpenAI shape sent to the client; the
+        # arguments are kept as a list of fragments and joined once at the end
+        collected_tool_calls = {}
 
         async for chunk in stream:
-            chunk_count += 1
             delta = chunk.choices[0].delta if chunk.choices else None
             if not delta:
                 continue
 
             # Handle content streaming
             if delta.content:
-                collected_content += delta.content
-                yield_data = f"data: {json.dumps({'type': 'content', 'content': delta.content})}\n\n"
-                sys.stdout.flush()
-                yield yield_data
-                # Force event loop to process I/O immediately
-                await asyncio.sleep(0)
+                content_parts.append(delta.content)
+                yield {"type": "content", "content": delta.content}
 
             # Handle tool calls
             if delta.tool_calls:
                 for tc_delta in delta.tool_calls:
                     if tc_delta.index is not None:
                         # New tool call or continuation
-                        while len(collected_tool_calls) <= tc_delta.index:
-                            collected_tool_calls.append({
+                        current = collected_tool_calls.get(tc_delta.index)
+                        if current is None:
+                            current = collected_tool_calls[tc_delta.index] = {
                                 "id": "",
                                 "type": "function",
-                                "function": {"name": "", "arguments": ""}
-                            })
-
-                        current = collected_tool_calls[tc_delta.index]
+                                "function": {"name": "", "arguments": []},
+                            }
 
                         if tc_delta.id:
                             current["id"] = tc_delta.id
@@ -354,11 +465,10 @@ async def generate_stream(request: StreamChatRequest) -> AsyncGenerator[str, Non
                             if tc_delta.function.name:
                                 current["function"]["name"] = tc_delta.function.name
                             if tc_delta.function.arguments:
-                                current["function"]["arguments"] += tc_delta.function.arguments
+                                current["function"]["arguments"].append(tc_delta.function.arguments)
 
         # Send final message with complete content and any tool calls
-        sys.stdout.flush()
-
+        collected_content = "".join(content_parts)
         final_response = {
             "type": "done",
             "role": "assistant",
@@ -366,56 +476,106 @@ async def generate_stream(request: StreamChatRequest) -> AsyncGenerator[str, Non
         }
 
         if collected_tool_calls:
-            print(f"[TOOL_DEBUG] NPC={request.npc_id} model returned {len(collected_tool_calls)} tool call(s): {[tc['function']['name'] for tc in collected_tool_calls]}")
-            sys.stdout.flush()
-            final_response["tool_calls"] = [
-                {
-                    "id": tc["id"],
-                    "type": tc["type"],
-                    "function": {
-                        "name": tc["function"]["name"],
-                        "arguments": tc["function"]["arguments"],
-                    }
-                }
-                for tc in collected_tool_calls
-            ]
-
-        print(f"[TOOL_DEBUG] NPC={request.npc_id} sending final SSE: has_tool_calls={'tool_calls' in final_response} content_len={len(collected_content)}")
-        sys.stdout.flush()
-        yield f"data: {json.dumps(final_response)}\n\n"
-        await asyncio.sleep(0)  # Force flush
+            tool_calls = [collected_tool_calls[index] for index in sorted(collected_tool_calls)]
+            for tc in tool_calls:
+                tc["function"]["arguments"] = "".join(tc["function"]["arguments"])
+            logger.debug(
+                "[TOOL_DEBUG] NPC=%s model returned %d tool call(s): %s",
+                request.npc_id, len(tool_calls), [tc["function"]["name"] for tc in tool_calls],
+            )
+            final_response["tool_calls"] = tool_calls
+
+        logger.debug(
+            "[TOOL_DEBUG] NPC=%s sending final SSE: has_tool_calls=%s content_len=%d",
+            request.npc_id, "tool_calls" in final_response, len(collected_content),
+        )
+        yield final_response
 
     except Exception as e:
-        import traceback
         error_msg = f"{type(e).__name__}: {str(e)}"
-        print(f"Streaming error: {error_msg}\n{traceback.format_exc()}")
-        yield f"data: {json.dumps({'type': 'error', 'error': error_msg})}\n\n"
+        logger.exception("Streaming error: %s", error_msg)
+        yield {"type": "error", "error": error_msg}
 
 
-@app.post("/chat/stream")
-async def chat_stream(request: StreamChatRequest):
+@app.post("/chat/stream", response_class=EventSourceResponse)
+async def chat_stream(request: StreamChatRequest, http_request: Request) -> AsyncIterable[dict]:
     """
     Streaming chat endpoint using Server-Sent Events (SSE).
     Returns text content as it's generated, then tool calls at the end.
+    FastAPI handles the SSE framing, keep-alive pings and no-buffering headers.
+    """
+    # Send an SSE comment immediately to establish the stream before the model answers
+    yield ServerSentEvent(comment="stream-start")
+    async for payload in generate_stream(request, http_request.app.state.async_client):
+        yield payload
+
+
+async def complete_chat(request: ChatRequest, async_client: AsyncOpenAI) -> ChatResponse:
+    """Run one non-streaming chat completion."""
+    openai_messages = prepare_history(request.npc_id, request.conversation_id, request.messages)
+    openai_tools = convert_tools(request.tools)
+
+    response = await async_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=openai_messages,
+        tools=openai_tools if openai_tools else None,
+        tool_choice="auto" if openai_tools else None,
+    )
+    message = response.choices[0].message
+
+    tool_calls = None
+    if message.tool_calls:
+        tool_calls = [
+            ToolCall(
+                id=tc.id,
+                type=tc.type,
+                function=ToolCallFunction(name=tc.function.name, arguments=tc.function.arguments),
+            )
+            for tc in message.tool_calls
+        ]
+    return ChatResponse(content=message.content or "", tool_calls=tool_calls)
+
+
+@app.post("/chat/batch", response_model=list[ChatResponse])
+async def chat_batch(
+    requests: Annotated[list[ChatRequest], Body(max_length=MAX_CHAT_BATCH_SIZE)],
+    http_request: Request,
+):
+    """
+    Non-streaming chat for several NPC conversations at once.
+    Up to CHAT_BATCH_CONCURRENCY completions run concurrently. A failed conversation
+    gets a response with its error set; the rest of the batch still completes.
     """
-    return StreamingResponse(
-        generate_stream(request),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        },
+    async_client = http_request.app.state.async_client
+    semaphore = asyncio.Semaphore(CHAT_BATCH_CONCURRENCY)
+
+    async def complete_one(request: ChatRequest) -> ChatResponse:
+        async with semaphore:
+            try:
+                return await complete_chat(request, async_client)
+            except Exception as e:
+                error_msg = f"{type(e).__name__}: {str(e)}"
+                logger.exception("Batch chat error for NPC %s: %s", request.npc_id, error_msg)
+                return ChatResponse(content="", error=error_msg)
+
+    responses = await asyncio.gather(*(complete_one(r) for r in requests))
+    # response_model stays for the OpenAPI schema; returning a Response skips re-validation
+    return Response(
+        content=_chat_responses_adapter.dump_json(responses),
+        media_type="application/json",
     )
 
 
 if __name__ == "__main__":
     import uvicorn
-    # Disable buffering for true streaming
+    # uvloop + httptools come with uvicorn[standard]; workers need the app as an import string
     uvicorn.run(
-        app,
+        "main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
         timeout_keep_alive=300,
         log_level="info"
     )
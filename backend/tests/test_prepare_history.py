@@ -0,0 +1,152 @@
+"""
+Tests for chat history preparation
+
+Checks that prepare_history, which resumes from the previous turn's converted
+history, matches converting and validating the whole history from scratch the
+way the original endpoint did.
+"""
+
+import random
+
+import pytest
+
+import main
+from main import ChatMessage, ToolCall, ToolCallFunction, prepare_history
+
+
+def reference_prepare(messages: list[ChatMessage]) -> list[dict]:
+    """Original conversion + validate_and_fix_messages, kept as the reference."""
+    openai_messages = []
+    for msg in messages:
+        message_dict = {
+            "role": msg.role,
+            "content": msg.content or "",
+        }
+        if msg.tool_call_id:
+            message_dict["tool_call_id"] = msg.tool_call_id
+        if msg.tool_calls:
+            message_dict["tool_calls"] = [
+                {
+                    "id": tc.id,
+                    "type": tc.type,
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    }
+                }
+                for tc in msg.tool_calls
+            ]
+        openai_messages.append(message_dict)
+
+    fixed_messages = []
+    pending_tool_calls = {}
+    for msg in openai_messages:
+        role = msg.get("role", "")
+        if role == "assistant" and msg.get("tool_calls"):
+            for tc in msg["tool_calls"]:
+                pending_tool_calls[tc["id"]] = tc
+            fixed_messages.append(msg)
+        elif role == "tool":
+            pending_tool_calls.pop(msg.get("tool_call_id"), None)
+            fixed_messages.append(msg)
+        else:
+            for tc_id, tc in pending_tool_calls.items():
+                fixed_messages.append({
+                    "role": "tool",
+                    "tool_call_id": tc_id,
+                    "content": f"Tool {tc['function']['name']} executed successfully."
+                })
+            pending_tool_calls.clear()
+            fixed_messages.append(msg)
+    for tc_id, tc in pending_tool_calls.items():
+        fixed_messages.append({
+            "role": "tool",
+            "tool_call_id": tc_id,
+            "content": f"Tool {tc['function']['name']} executed successfully."
+        })
+    return fixed_messages
+
+
+def random_message(rng: random.Random, open_ids: list[str]) -> ChatMessage:
+    """A random chat message, sometimes answering or opening tool calls."""
+    kind = rng.choice(["user", "assistant", "tool_calls", "tool"])
+    if kind == "tool_calls":
+        tool_calls = []
+        for _ in range(rng.randint(1, 3)):
+            tc_id = f"call_{rng.randint(0, 20)}"
+            open_ids.append(tc_id)
+            tool_calls.append(ToolCall(
+                id=tc_id,
+                function=ToolCallFunction(
+                    name=rng.choice(["offer_quest", "give_item", "end_conversation"]),
+                    arguments=f'{{"value": {rng.randint(0, 3)}}}',
+                ),
+            ))
+        return ChatMessage(role="assistant", content=rng.choice([None, "", "ok"]), tool_calls=tool_calls)
+    if kind == "tool":
+        tc_id = rng.choice(open_ids) if open_ids and rng.random() < 0.8 else "call_unknown"
+        return ChatMessage(role="tool", content="done", tool_call_id=tc_id)
+    return ChatMessage(role=kind, content=rng.choice(["hola", "adiós", "¿qué tal?", None]))
+
+
+@pytest.fixture(autouse=True)
+def clear_prepared_histories():
+    main._prepared_histories.clear()
+    yield
+    main._prepared_histories.clear()
+
+
+class TestPrepareHistory:
+    """prepare_history must always match a from-scratch conversion."""
+
+    def test_growing_history_matches_reference(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            history, open_ids = [], []
+            for _ in range(rng.randint(1, 15)):
+                history.extend(random_message(rng, open_ids) for _ in range(rng.randint(1, 3)))
+                assert prepare_history("npc_1", "conv_1", history) == reference_prepare(history)
+            main._prepared_histories.clear()
+
+    def test_edited_history_matches_reference(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            history, open_ids = [], []
+            for _ in range(rng.randint(2, 10)):
+                history.append(random_message(rng, open_ids))
+            prepare_history("npc_1", "conv_1", history)
+
+            # Rewrite an earlier message, then keep growing the history
+            history[rng.randrange(len(history))] = random_message(rng, open_ids)
+            history.append(random_message(rng, open_ids))
+            assert prepare_history("npc_1", "conv_1", history) == reference_prepare(history)
+
+    def test_changed_tool_call_arguments_are_not_replayed(self):
+        def history(arguments: str) -> list[ChatMessage]:
+            return [
+                ChatMessage(role="user", content="hola"),
+                ChatMessage(role="assistant", tool_calls=[
+                    ToolCall(id="call_1", function=ToolCallFunction(name="give_item", arguments=arguments)),
+                ]),
+            ]
+
+        prepare_history("npc_1", "conv_1", history('{"item": "apple"}'))
+        prepared = prepare_history("npc_1", "conv_1", history('{"item": "bread"}'))
+        assert prepared[1]["tool_calls"][0]["function"]["arguments"] == '{"item": "bread"}'
+
+    def test_conversations_with_one_npc_are_kept_apart(self):
+        rng = random.Random(2)
+        histories = {"conv_a": ([], []), "conv_b": ([], [])}
+        for _ in range(200):
+            conversation_id = rng.choice(list(histories))
+            history, open_ids = histories[conversation_id]
+            history.append(random_message(rng, open_ids))
+            assert prepare_history("npc_1", conversation_id, history) == reference_prepare(history)
+        assert set(main._prepared_histories) == {("npc_1", "conv_a"), ("npc_1", "conv_b")}
+
+    def test_without_conversation_id_nothing_is_cached(self):
+        rng = random.Random(3)
+        open_ids = []
+        history = [random_message(rng, open_ids) for _ in range(10)]
+        assert prepare_history("npc_1", None, history) == reference_prepare(history)
+        assert not main._prepared_histories
@@ -2,6 +2,7 @@ import 'dart:convert';
 import 'dart:async';
 import 'dart:io';
 import 'package:flutter/foundation.dart';
+import 'package:uuid/uuid.dart';
 import '../game_models.dart';
 
 /// Message in a conversation
@@ -119,6 +120,10 @@ class NPCChatbotService extends ChangeNotifier {
   // Message count per NPC (for guardrails)
   final Map<String, int> _messageCount = {};
 
+  // Conversation ID per NPC, so the backend can tell conversations apart
+  final Map<String, String> _conversationIds = {};
+  static const _uuid = Uuid();
+
   // Tool execution callback
   ToolExecutionCallback? onToolExecuted;
 
@@ -137,6 +142,7 @@ class NPCChatbotService extends ChangeNotifier {
   void clearConversation(String npcId) {
     _conversations.remove(npcId);
     _messageCount.remove(npcId);
+    _conversationIds.remove(npcId);
     _streamingContent.remove(npcId);
     notifyListeners();
   }
@@ -718,6 +724,7 @@ LANGUAGE MIX (Default): 80% English, 20% Spanish
           ),
         ];
         _messageCount[npc.id] = 0;
+        _conversationIds[npc.id] = _uuid.v4();
       } else {
         // Update the system prompt with fresh quest data
         if (_conversations[npc.id]!.isNotEmpty &&
@@ -798,6 +805,7 @@ LANGUAGE MIX (Default): 80% English, 20% Spanish
       );
 
       // Initialize conversation with system prompt
+      _conversationIds[npc.id] = _uuid.v4();
       _conversations[npc.id] = [
         ChatMessage(
           role: 'system',
@@ -880,6 +888,7 @@ LANGUAGE MIX (Default): 80% English, 20% Spanish
         'messages': messages.map((m) => m.toJson()).toList(),
         'tools': tools,
         'npc_id': npc.id,
+        'conversation_id': _conversationIds[npc.id],
         'message_count': messageCount,
         'available_quest_ids': npcQuestIds,
       };
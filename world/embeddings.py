@@ -5,29 +5,46 @@ Handles creating, storing, and querying OpenAI embeddings
 for language learning documents.
 """
 
+import asyncio
 import json
 import hashlib
-import pickle
+import re
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import os
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     print("Please install openai: pip install openai")
     raise
 
 import numpy as np
 
+try:
+    import faiss
+except ImportError:
+    faiss = None  # Optional: query() falls back to a NumPy scan
+
+_BOUNDARY_RE = re.compile(r'[.\n]')
+
 
 class DocumentEmbedder:
     """Manages document embeddings for the language learning content."""
 
-    SUPPORTED_EXTENSIONS = {'.txt', '.md', '.pdf', '.json', '.csv'}
+    SUPPORTED_EXTENSIONS = frozenset({'.txt', '.md', '.pdf', '.json', '.csv'})
     EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_DTYPE = np.float32  # Lossless for OpenAI embeddings, half the bytes of float64
     CHUNK_SIZE = 1000  # Characters per chunk
     CHUNK_OVERLAP = 200  # Overlap between chunks
+    EMBEDDING_BATCH_SIZE = 500  # Inputs per request (OpenAI allows up to 2048)
+    MAX_CONCURRENT_REQUESTS = 8
+    MAX_RETRIES = 4  # Client retries per batch on rate limits and transient errors
+    MAX_READ_WORKERS = 32
+    QUANTIZED_INDEX_MIN_CHUNKS = 50_000  # Above this, search an int8 FAISS index
+    MAX_CACHED_QUERIES = 1024  # Query embeddings kept before the oldest is evicted
 
     def __init__(
         self,
@@ -38,23 +55,55 @@ class DocumentEmbedder:
         self.doc_path = doc_path
         self.output_path = output_path
         self.force_rebuild = force_rebuild
-        self.embeddings_file = output_path / "embeddings.pkl"
+        self.embeddings_file = output_path / "embeddings.npy"
+        self.chunks_file = output_path / "chunks.json"
         self.metadata_file = output_path / "embeddings_metadata.json"
         self.client = OpenAI()
 
         self.documents: List[Dict[str, Any]] = []
+        # Unit-length rows, memory-mapped from embeddings.npy once saved
         self.embeddings: Optional[np.ndarray] = None
+        self.index = None
         self.chunks: List[Dict[str, Any]] = []
 
-    def _compute_directory_hash(self) -> str:
+        # Query text -> unit-length embedding
+        self._query_embeddings: Dict[str, np.ndarray] = {}
+
+    def _scan_documents(self) -> Tuple[List[Tuple[str, os.stat_result]], int]:
+        """Walk doc_path with os.scandir, stat'ing each supported file once.
+
+        Returns the files sorted by path along with the newest mtime seen on
+        any file or directory; directory mtimes change when entries are
+        added, removed or renamed, so this alone detects most edits.
+        """
+        files = []
+        latest_mtime_ns = self.doc_path.stat().st_mtime_ns
+        stack = [str(self.doc_path)]
+
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        latest_mtime_ns = max(latest_mtime_ns, entry.stat(follow_symlinks=False).st_mtime_ns)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in self.SUPPORTED_EXTENSIONS:
+                        st = entry.stat()
+                        files.append((entry.path, st))
+                        latest_mtime_ns = max(latest_mtime_ns, st.st_mtime_ns)
+
+        files.sort(key=lambda f: f[0])
+        return files, latest_mtime_ns
+
+    def _compute_directory_hash(self, files: Optional[List[Tuple[str, os.stat_result]]] = None) -> str:
         """Compute a hash of all documents to detect changes."""
-        hasher = hashlib.md5()
+        if files is None:
+            files, _ = self._scan_documents()
 
-        for file_path in sorted(self.doc_path.rglob("*")):
-            if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                hasher.update(str(file_path).encode())
-                hasher.update(str(file_path.stat().st_mtime).encode())
-                hasher.update(str(file_path.stat().st_size).encode())
+        hasher = hashlib.blake2b(digest_size=16)
+        for path, st in files:
+            hasher.update(path.encode())
+            hasher.update(st.st_mtime_ns.to_bytes(8, 'little'))
+            hasher.update(st.st_size.to_bytes(8, 'little'))
 
         return hasher.hexdigest()
 
@@ -63,14 +112,18 @@ class DocumentEmbedder:
         if self.force_rebuild:
             return True
 
-        if not self.embeddings_file.exists() or not self.metadata_file.exists():
+        if not all(f.exists() for f in (self.embeddings_file, self.chunks_file, self.metadata_file)):
             return True
 
         try:
             with open(self.metadata_file, 'r') as f:
                 metadata = json.load(f)
 
-            current_hash = self._compute_directory_hash()
+            files, latest_mtime_ns = self._scan_documents()
+            if metadata.get('latest_mtime_ns') == latest_mtime_ns:
+                return False
+
+            current_hash = self._compute_directory_hash(files)
             if metadata.get('directory_hash') != current_hash:
                 return True
 
@@ -114,23 +167,22 @@ class DocumentEmbedder:
         """Split text into overlapping chunks."""
         chunks = []
         start = 0
+        # Candidate break points, found in one pass instead of rfind() per chunk
+        boundaries = [m.start() for m in _BOUNDARY_RE.finditer(text)]
 
         while start < len(text):
             end = start + self.CHUNK_SIZE
-            chunk_text = text[start:end]
 
             # Try to break at sentence boundary
             if end < len(text):
-                last_period = chunk_text.rfind('.')
-                last_newline = chunk_text.rfind('\n')
-                break_point = max(last_period, last_newline)
-                if break_point > self.CHUNK_SIZE // 2:
-                    chunk_text = chunk_text[:break_point + 1]
-                    end = start + break_point + 1
-
-            if chunk_text.strip():
+                i = bisect_left(boundaries, end) - 1
+                if i >= 0 and boundaries[i] - start > self.CHUNK_SIZE // 2:
+                    end = boundaries[i] + 1
+
+            chunk_text = text[start:end].strip()
+            if chunk_text:
                 chunks.append({
-                    'text': chunk_text.strip(),
+                    'text': chunk_text,
                     'source': source,
                     'start_char': start,
                     'end_char': end
@@ -143,11 +195,23 @@ class DocumentEmbedder:
     def _load_documents(self) -> List[Dict[str, Any]]:
         """Load all documents from the directory."""
         documents = []
-
-        for file_path in self.doc_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
+        files, _ = self._scan_documents()
+        paths = [Path(path) for path, _ in files]
+        if not paths:
+            return documents
+
+        # Text reads are I/O bound, so threads overlap them. PyMuPDF does not support
+        # multithreading, so PDFs are parsed one at a time on this thread meanwhile.
+        with ThreadPoolExecutor(max_workers=min(self.MAX_READ_WORKERS, len(paths))) as executor:
+            text_reads = {
+                file_path: executor.submit(self._read_file, file_path)
+                for file_path in paths if file_path.suffix.lower() != '.pdf'
+            }
+
+            for file_path in paths:
+                text_read = text_reads.get(file_path)
+                content = text_read.result() if text_read is not None else self._read_file(file_path)
                 print(f"  Loading: {file_path.name}")
-                content = self._read_file(file_path)
                 if content:
                     documents.append({
                         'path': str(file_path),
@@ -157,75 +221,121 @@ class DocumentEmbedder:
 
         return documents
 
-    def _create_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Create embeddings for a list of texts using OpenAI API."""
-        embeddings = []
-        batch_size = 100  # OpenAI allows up to 2048, but we'll be conservative
-
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            print(f"  Creating embeddings batch {i // batch_size + 1}...")
-
-            response = self.client.embeddings.create(
+    async def _embed_batch(
+        self,
+        client: "AsyncOpenAI",
+        semaphore: asyncio.Semaphore,
+        batch: List[str],
+        batch_num: int
+    ) -> List[List[float]]:
+        """Embed one batch; the client retries rate-limited requests with backoff."""
+        async with semaphore:
+            print(f"  Creating embeddings batch {batch_num}...")
+            response = await client.embeddings.create(
                 model=self.EMBEDDING_MODEL,
                 input=batch
             )
+            return [item.embedding for item in response.data]
+
+    async def _create_embeddings_async(self, texts: List[str]) -> np.ndarray:
+        """Create embeddings with up to MAX_CONCURRENT_REQUESTS batches in flight."""
+        batch_size = self.EMBEDDING_BATCH_SIZE
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async with AsyncOpenAI(max_retries=self.MAX_RETRIES) as client:
+            batches = await asyncio.gather(*(
+                self._embed_batch(client, semaphore, texts[i:i + batch_size], i // batch_size + 1)
+                for i in range(0, len(texts), batch_size)
+            ))
+
+        # gather preserves order, so rows still line up with self.chunks
+        return np.asarray(
+            [embedding for batch in batches for embedding in batch],
+            dtype=self.EMBEDDING_DTYPE
+        )
 
-            for item in response.data:
-                embeddings.append(item.embedding)
-
-        return np.array(embeddings)
+    def _create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Create embeddings for a list of texts using OpenAI API."""
+        return asyncio.run(self._create_embeddings_async(texts))
 
     def _save_embeddings(self):
         """Save embeddings and metadata to disk."""
-        # Save embeddings
-        with open(self.embeddings_file, 'wb') as f:
-            pickle.dump({
-                'embeddings': self.embeddings,
-                'chunks': self.chunks
-            }, f)
+        # Save the unit-length rows as a raw .npy so loads can memory-map and rank
+        # against them directly
+        np.save(self.embeddings_file, self.embeddings)
+
+        with open(self.chunks_file, 'w', encoding='utf-8') as f:
+            json.dump(self.chunks, f, ensure_ascii=False)
 
         # Save metadata
+        files, latest_mtime_ns = self._scan_documents()
         metadata = {
-            'directory_hash': self._compute_directory_hash(),
+            'directory_hash': self._compute_directory_hash(files),
+            'latest_mtime_ns': latest_mtime_ns,
             'num_documents': len(self.documents),
             'num_chunks': len(self.chunks),
             'embedding_model': self.EMBEDDING_MODEL,
+            'normalized_rows': True,
             'documents': [{'name': d['name'], 'path': d['path']} for d in self.documents]
         }
 
         with open(self.metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
 
-    def _load_embeddings(self):
-        """Load embeddings from disk."""
-        with open(self.embeddings_file, 'rb') as f:
-            data = pickle.load(f)
-            self.embeddings = data['embeddings']
-            self.chunks = data['chunks']
-
+    def _read_embedding_files(self) -> Dict[str, Any]:
+        """Memory-map the embedding matrix, load its chunks and return the metadata."""
         with open(self.metadata_file, 'r') as f:
             metadata = json.load(f)
-            print(f"  Loaded {metadata['num_chunks']} chunks from {metadata['num_documents']} documents")
+
+        self.embeddings = np.load(self.embeddings_file, mmap_mode='r')
+        if not metadata.get('normalized_rows'):
+            # Written before rows were normalized at save time; normalize in memory
+            self.embeddings = self._normalize_rows(self.embeddings)
+        with open(self.chunks_file, 'r', encoding='utf-8') as f:
+            self.chunks = json.load(f)
+        self._build_index()
+        return metadata
+
+    def _load_embeddings(self):
+        """Load embeddings from disk."""
+        metadata = self._read_embedding_files()
+        print(f"  Loaded {metadata['num_chunks']} chunks from {metadata['num_documents']} documents")
+
+    @staticmethod
+    def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length so query() is a single matrix-vector product."""
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def _build_index(self):
+        """Build a FAISS index over the unit-length rows when FAISS is installed."""
+        # Inner product of unit vectors is cosine similarity
+        if faiss is not None:
+            vectors = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+            dim = vectors.shape[1]
+            if len(vectors) >= self.QUANTIZED_INDEX_MIN_CHUNKS:
+                # 8-bit codes: a quarter of the memory traffic, scanned with SIMD int kernels
+                self.index = faiss.IndexScalarQuantizer(
+                    dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+                )
+                self.index.train(vectors)
+            else:
+                self.index = faiss.IndexFlatIP(dim)
+            self.index.add(vectors)
 
     def load_existing(self):
         """Load existing embeddings without checking directory hash.
 
         Use this when copying embeddings from another location.
         """
-        if not self.embeddings_file.exists() or not self.metadata_file.exists():
+        if not all(f.exists() for f in (self.embeddings_file, self.chunks_file, self.metadata_file)):
             raise FileNotFoundError(
                 f"Embeddings files not found at {self.output_path}. "
-                "Expected 'embeddings.pkl' and 'embeddings_metadata.json'"
+                "Expected 'embeddings.npy', 'chunks.json' and 'embeddings_metadata.json'"
             )
 
-        with open(self.embeddings_file, 'rb') as f:
-            data = pickle.load(f)
-            self.embeddings = data['embeddings']
-            self.chunks = data['chunks']
-
-        with open(self.metadata_file, 'r') as f:
-            self.metadata = json.load(f)
+        self.metadata = self._read_embedding_files()
 
     def process(self):
         """Process documents and create/load embeddings."""
@@ -247,45 +357,73 @@ class DocumentEmbedder:
 
             # Create embeddings
             texts = [chunk['text'] for chunk in self.chunks]
-            self.embeddings = self._create_embeddings(texts)
+            self.embeddings = self._normalize_rows(self._create_embeddings(texts))
 
-            # Save
+            # Save, then rank against the memory-mapped file rather than the in-RAM copy
             self._save_embeddings()
+            self.embeddings = np.load(self.embeddings_file, mmap_mode='r')
+            self._build_index()
             print("  Embeddings saved.")
         else:
             print("  Loading existing embeddings...")
             self._load_embeddings()
 
-    def query(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Query the embeddings and return the most relevant chunks."""
-        if self.embeddings is None:
-            raise ValueError("Embeddings not loaded. Call process() first.")
-
-        # Create query embedding
-        response = self.client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=[query_text]
-        )
-        query_embedding = np.array(response.data[0].embedding)
-
-        # Compute cosine similarity
-        similarities = np.dot(self.embeddings, query_embedding) / (
-            np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-        )
+    def _query_vector(self, embedding: List[float]) -> np.ndarray:
+        """Unit-length query vector, cached by query text in query()."""
+        query_embedding = np.asarray(embedding, dtype=self.EMBEDDING_DTYPE)
+        query_embedding /= np.linalg.norm(query_embedding)
+        return query_embedding
+
+    def _rank(self, query_embedding: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+        """Return the top_k chunks most similar to a unit-length query vector."""
+        top_k = min(top_k, len(self.chunks))
+        if top_k <= 0:
+            return []
+
+        if self.index is not None:
+            # FAISS computes the similarities and the sorted top-k in one call
+            scores, indices = self.index.search(
+                np.ascontiguousarray(query_embedding.reshape(1, -1), dtype=np.float32), top_k
+            )
+            top_hits = zip(indices[0], scores[0])
+        else:
+            # Compute cosine similarity against the pre-normalized rows
+            similarities = self.embeddings @ query_embedding
 
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+            # Get top-k indices: partial selection is O(N), then sort only the survivors
+            top_indices = np.argpartition(-similarities, top_k - 1)[:top_k]
+            top_indices = top_indices[np.argsort(-similarities[top_indices])]
+            top_hits = ((idx, similarities[idx]) for idx in top_indices)
 
         results = []
-        for idx in top_indices:
+        for idx, similarity in top_hits:
             results.append({
                 'text': self.chunks[idx]['text'],
                 'source': self.chunks[idx]['source'],
-                'similarity': float(similarities[idx])
+                'similarity': float(similarity)
             })
 
         return results
 
+    def query(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Query the embeddings and return the most relevant chunks."""
+        if self.embeddings is None:
+            raise ValueError("Embeddings not loaded. Call process() first.")
+
+        query_embedding = self._query_embeddings.get(query_text)
+        if query_embedding is None:
+            # Create query embedding
+            response = self.client.embeddings.create(
+                model=self.EMBEDDING_MODEL,
+                input=[query_text]
+            )
+            query_embedding = self._query_vector(response.data[0].embedding)
+            if len(self._query_embeddings) >= self.MAX_CACHED_QUERIES:
+                del self._query_embeddings[next(iter(self._query_embeddings))]
+            self._query_embeddings[query_text] = query_embedding
+
+        return self._rank(query_embedding, top_k)
+
     def get_all_content(self) -> str:
         """Get all document content concatenated."""
         if not self.chunks:
@@ -1,77 +1,86 @@
 """RPG World Generators Package"""
 
-from .base_generator import BaseGenerator
-from .lore_generator import LoreGenerator
-from .npc_generator import NPCGenerator
-from .map_generator import MapGenerator
-from .quest_generator import QuestGenerator
-from .item_generator import ItemGenerator
-from .game_generator import GameGenerator
-from .quest_validator import QuestValidator, ValidationSeverity, ValidationIssue
-from .tutor_generator import TutorGenerator
-from .skill_generator import SkillGenerator
-from .trigger_generator import TriggerGenerator
-from .trigger_validator import TriggerValidator
-from .level_progression import LevelProgressionGenerator, LevelProgressionEvaluator
-from .world_orchestrator import WorldOrchestrator
+import importlib
 
-# Pydantic models
-from .models import (
+# Exported name -> submodule that defines it. Submodules are imported on first
+# attribute access (PEP 562), so e.g. the validators can be used without pulling
+# in every generator and the OpenAI client.
+_LAZY_IMPORTS = {
+    # Generators
+    'BaseGenerator': '.base_generator',
+    'LoreGenerator': '.lore_generator',
+    'NPCGenerator': '.npc_generator',
+    'MapGenerator': '.map_generator',
+    'QuestGenerator': '.quest_generator',
+    'ItemGenerator': '.item_generator',
+    'GameGenerator': '.game_generator',
+    'QuestValidator': '.quest_validator',
+    'ValidationSeverity': '.quest_validator',
+    'ValidationIssue': '.quest_validator',
+    'TutorGenerator': '.tutor_generator',
+    'SkillGenerator': '.skill_generator',
+    'TriggerGenerator': '.trigger_generator',
+    'TriggerValidator': '.trigger_validator',
+    'LevelProgressionGenerator': '.level_progression',
+    'LevelProgressionEvaluator': '.level_progression',
+    'WorldOrchestrator': '.world_orchestrator',
+    # Pydantic models
     # Core types
-    BilingualText,
-    LanguageLevel,
+    'BilingualText': '.models',
+    'LanguageLevel': '.models',
     # NPC models
-    NPC,
-    NPCList,
-    NPCPersonality,
-    NPCKnowledge,
-    NPCExampleInteraction,
-    NPCBehavioralBoundaries,
-    NPCRelationship,
-    NPCRelationshipList,
+    'NPC': '.models',
+    'NPCList': '.models',
+    'NPCPersonality': '.models',
+    'NPCKnowledge': '.models',
+    'NPCExampleInteraction': '.models',
+    'NPCBehavioralBoundaries': '.models',
+    'NPCRelationship': '.models',
+    'NPCRelationshipList': '.models',
     # Quest models
-    Quest,
-    QuestList,
-    QuestTask,
-    QuestDialogue,
-    TaskCompletionCriteria,
+    'Quest': '.models',
+    'QuestList': '.models',
+    'QuestTask': '.models',
+    'QuestDialogue': '.models',
+    'TaskCompletionCriteria': '.models',
     # Item models
-    Item,
-    ItemList,
+    'Item': '.models',
+    'ItemList': '.models',
     # Location models
-    Location,
-    LocationList,
-    LocationConnection,
+    'Location': '.models',
+    'LocationList': '.models',
+    'LocationConnection': '.models',
     # Lore models
-    WorldLore,
-    WorldTheme,
+    'WorldLore': '.models',
+    'WorldTheme': '.models',
     # Tutor models
-    TutorPromptData,
-    GrammarCurriculum,
+    'TutorPromptData': '.models',
+    'GrammarCurriculum': '.models',
     # Trigger system models
-    TriggerType,
-    TriggerOperator,
-    TriggerCondition,
-    CompoundLogic,
-    CompoundTrigger,
-    TriggerValidationError,
-    TriggerValidationResult,
+    'TriggerType': '.models',
+    'TriggerOperator': '.models',
+    'TriggerCondition': '.models',
+    'CompoundLogic': '.models',
+    'CompoundTrigger': '.models',
+    'TriggerValidationError': '.models',
+    'TriggerValidationResult': '.models',
     # Skill models
-    SkillCategory,
-    LanguageSkill,
-    LanguageSkillList,
+    'SkillCategory': '.models',
+    'LanguageSkill': '.models',
+    'LanguageSkillList': '.models',
     # Skill progression models
-    SkillProgressionTrigger,
-    SkillProgressionTriggerList,
+    'SkillProgressionTrigger': '.models',
+    'SkillProgressionTriggerList': '.models',
     # Level progression models
-    SkillThreshold,
-    LevelProgressionRequirement,
-    LevelProgressionConfig,
+    'SkillThreshold': '.models',
+    'LevelProgressionRequirement': '.models',
+    'LevelProgressionConfig': '.models',
     # Mini-game models
-    GameTriggerType,
-    GameTrigger,
-    MiniGame,
-)
+    'GameTriggerType': '.models',
+    'GameTrigger': '.models',
+    'MiniGame': '.models',
+    'MiniGameList': '.models',
+}
 
 __all__ = [
     # Generators
@@ -146,4 +155,19 @@ __all__ = [
     'GameTriggerType',
     'GameTrigger',
     'MiniGame',
+    'MiniGameList',
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
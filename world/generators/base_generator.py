@@ -4,15 +4,52 @@ Base Generator Class
 Provides common functionality for all world generators.
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
 import json
+import logging
+import os
 import re
-from typing import Dict, Any, List, Optional, Type, TypeVar
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple, Type, TypeVar, Union
 from pathlib import Path
-from openai import OpenAI
+import orjson
+from openai import (
+    OpenAI, AsyncOpenAI, APIError, NOT_GIVEN,
+    LengthFinishReasonError, ContentFilterFinishReasonError, pydantic_function_tool,
+)
 from pydantic import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
 
+logger = logging.getLogger(__name__)
+
+# A run of non-alphanumerics becomes one underscore, so no separate collapse pass
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# ASCII fast path for slugify: every byte outside [a-z0-9] becomes a space,
+# so str.split() collapses the runs and drops leading/trailing separators
+_SLUG_BYTES = bytes(
+    c if (0x61 <= c <= 0x7a or 0x30 <= c <= 0x39) else 0x20 for c in range(256)
+)
+
+# A JSON string (possibly cut off at the end), a stray backslash, or a bracket
+_JSON_STRUCTURE_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|\\.?|[\[\]{}]', re.DOTALL)
+
+# Event loop -> AsyncOpenAI client; httpx connection pools cannot be shared across loops
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+# save_json() writes still in flight, plus failed ones not yet raised by
+# BaseGenerator.flush_writes(); successful writes drop out as they finish
+_pending_writes: Set[Future] = set()
+_pending_writes_lock = threading.Lock()
+
 
 class BaseGenerator:
     """Base class for all generators with common OpenAI interaction logic."""
@@ -55,6 +92,22 @@ class BaseGenerator:
             "topics": ["travel", "work", "health", "opinions", "plans"]
         }
     }
+    PROFICIENCY_LEVELS_JSON = json.dumps(PROFICIENCY_LEVELS, indent=2)
+
+    # Retries for 408/409/429/5xx and connection errors, done by the OpenAI client with
+    # exponential backoff and jitter, honoring Retry-After when the API sends it
+    MAX_API_RETRIES = 6
+
+    # Batch API polling: start here and back off up to the maximum (seconds)
+    BATCH_POLL_INTERVAL = 5.0
+    BATCH_MAX_POLL_INTERVAL = 60.0
+
+    # On-disk store for the _cached_call_openai() helpers. Opt-in: a normal rerun
+    # is meant to produce fresh content, but iterating on later stages shouldn't
+    # re-pay for identical prompts.
+    RESPONSE_CACHE_PATH = (
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "vocari" / "llm_cache.db"
+    )
 
     def __init__(
         self,
@@ -67,7 +120,32 @@ class BaseGenerator:
         self.target_language = target_language
         self.native_language = native_language
         self.output_path = output_path
-        self.client = OpenAI()
+        self.client = self._shared_client()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _shared_client() -> OpenAI:
+        """One OpenAI client, and so one keep-alive connection pool, for every generator."""
+        return OpenAI(max_retries=BaseGenerator.MAX_API_RETRIES)
+
+    @staticmethod
+    def _shared_async_client() -> AsyncOpenAI:
+        """The AsyncOpenAI client for the running event loop, created on first use.
+
+        Whoever runs the loop must await close_async_client() before the loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncOpenAI(max_retries=BaseGenerator.MAX_API_RETRIES)
+        return client
+
+    @staticmethod
+    async def close_async_client():
+        """Close the running event loop's AsyncOpenAI client, if one was created."""
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
 
     def bilingual_text(self, native: str, target: str) -> Dict[str, str]:
         """Create a bilingual text entry."""
@@ -76,86 +154,326 @@ class BaseGenerator:
             "target_language": target
         }
 
-    def call_openai(
+    def _call_openai_raw(
         self,
         system_prompt: str,
         user_prompt: str,
         model: str = "gpt-4o",
         response_format: Optional[Dict] = None
-    ) -> str:
-        """Call OpenAI API and return the response content."""
-        content, _ = self._call_openai_raw(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
+    ) -> tuple[str, str]:
+        """Call OpenAI API and return the response and finish reason."""
+        response = self.client.chat.completions.create(
             model=model,
-            response_format=response_format
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=response_format or NOT_GIVEN
         )
-        return content
+        content = response.choices[0].message.content
+        finish_reason = response.choices[0].finish_reason
+        return content, finish_reason
 
-    def _call_openai_raw(
+    async def _acall_openai_raw(
         self,
         system_prompt: str,
         user_prompt: str,
         model: str = "gpt-4o",
-        response_format: Optional[Dict] = None
+        response_format: Optional[Dict] = None,
+        prompt_cache_key: Optional[str] = None
     ) -> tuple[str, str]:
-        """Call OpenAI API and return the response and finish reason."""
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-
-        kwargs = {
-            "model": model,
-            "messages": messages,
-        }
-
-        if response_format:
-            kwargs["response_format"] = response_format
+        """Async _call_openai_raw().
 
-        response = self.client.chat.completions.create(**kwargs)
+        prompt_cache_key routes requests that share a long prompt prefix to the same
+        server-side prompt cache.
+        """
+        response = await self._shared_async_client().chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=response_format or NOT_GIVEN,
+            prompt_cache_key=prompt_cache_key or NOT_GIVEN
+        )
         content = response.choices[0].message.content
         finish_reason = response.choices[0].finish_reason
         return content, finish_reason
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _response_cache_db() -> sqlite3.Connection:
+        """The response cache database, opened (and created) on first use."""
+        path = BaseGenerator.RESPONSE_CACHE_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        return db
+
+    @staticmethod
+    def _response_cache_key(
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        response_format: Optional[Dict]
+    ) -> str:
+        return hashlib.blake2b(
+            orjson.dumps([model, system_prompt, user_prompt, response_format])
+        ).hexdigest()
+
+    def _cache_lookup(self, key: str) -> Optional[str]:
+        row = self._response_cache_db().execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _cache_store(self, key: str, content: Optional[str], finish_reason: str):
+        # Truncated or filtered responses are retried next time rather than replayed
+        if finish_reason == "stop" and content is not None:
+            self._response_cache_db().execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, content, time.time())
+            )
+
+    def _evict_cached_response(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gpt-4o",
+        response_format: Optional[Dict] = None
+    ):
+        """Drop a cached response, e.g. one the caller could not use."""
+        key = self._response_cache_key(system_prompt, user_prompt, model, response_format)
+        self._response_cache_db().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _cached_call_openai(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gpt-4o",
+        response_format: Optional[Dict] = None
+    ) -> tuple[str, str]:
+        """_call_openai_raw() backed by the on-disk response cache."""
+        key = self._response_cache_key(system_prompt, user_prompt, model, response_format)
+        content = self._cache_lookup(key)
+        if content is not None:
+            return content, "stop"
+
+        content, finish_reason = self._call_openai_raw(system_prompt, user_prompt, model, response_format)
+        self._cache_store(key, content, finish_reason)
+        return content, finish_reason
+
+    async def _acached_call_openai(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gpt-4o",
+        response_format: Optional[Dict] = None,
+        prompt_cache_key: Optional[str] = None
+    ) -> tuple[str, str]:
+        """Async _cached_call_openai()."""
+        key = self._response_cache_key(system_prompt, user_prompt, model, response_format)
+        content = self._cache_lookup(key)
+        if content is not None:
+            return content, "stop"
+
+        content, finish_reason = await self._acall_openai_raw(
+            system_prompt, user_prompt, model, response_format, prompt_cache_key
+        )
+        self._cache_store(key, content, finish_reason)
+        return content, finish_reason
+
     def call_openai_structured(
         self,
         system_prompt: str,
         user_prompt: str,
         response_model: Type[T],
         model: str = "gpt-4o",
+        cache: bool = False,
     ) -> T:
         """Call OpenAI with Pydantic structured output.
 
-        Uses OpenAI's beta.chat.completions.parse() for guaranteed schema compliance.
-        This eliminates the need for JSON repair logic.
+        Uses a strict json_schema response format for guaranteed schema compliance.
+        This eliminates the need for JSON repair logic. With cache=True responses go
+        through the on-disk response cache.
         """
-        response = self.client.beta.chat.completions.parse(
+        response_format = self._structured_response_format(response_model)
+        if cache:
+            key = self._response_cache_key(system_prompt, user_prompt, model, response_format)
+            content = self._cache_lookup(key)
+            if content is not None:
+                return response_model.model_validate_json(content)
+
+        response = self.client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            response_format=response_model,
+            response_format=response_format,
+        )
+        parsed = self._parse_structured(response, response_model)
+        if cache:
+            # Stored only once it has validated
+            choice = response.choices[0]
+            self._cache_store(key, choice.message.content, choice.finish_reason)
+        return parsed
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _structured_response_format(response_model: Type[BaseModel]) -> Dict[str, Any]:
+        """Strict json_schema response format for a model, built once per class.
+
+        beta.chat.completions.parse() regenerates the schema on every call, which
+        costs a few milliseconds for the nested bilingual models. The strict schema
+        comes from the SDK's public pydantic_function_tool() helper.
+        """
+        schema = pydantic_function_tool(response_model)["function"]["parameters"]
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": response_model.__name__,
+                "schema": schema,
+                "strict": True,
+            },
+        }
+
+    @staticmethod
+    def _parse_structured(response, response_model: Type[T]) -> Optional[T]:
+        """Validate a structured-output completion, with the same failure modes as .parse()."""
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise LengthFinishReasonError(completion=response)
+        if choice.finish_reason == "content_filter":
+            raise ContentFilterFinishReasonError(completion=response)
+
+        content = choice.message.content
+        if content is None:
+            # Refusal: .parse() left message.parsed unset as well
+            return None
+        # pydantic-core parses and validates in one pass, with no intermediate dict
+        return response_model.model_validate_json(content)
+
+    def call_openai_many(
+        self,
+        prompt_pairs: List[Tuple[str, str]],
+        response_model: Type[T],
+        model: str = "gpt-4o",
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> List[Union[T, Exception]]:
+        """Run independent call_openai_structured() calls concurrently.
+
+        prompt_pairs are (system_prompt, user_prompt) tuples; results keep their order.
+        With return_exceptions=True a failed call yields its exception instead of raising,
+        so callers can fall back per item.
+        """
+        def call(pair: Tuple[str, str]) -> Union[T, Exception]:
+            system_prompt, user_prompt = pair
+            try:
+                return self.call_openai_structured(system_prompt, user_prompt, response_model, model)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        if not prompt_pairs:
+            return []
+
+        # The OpenAI client is thread-safe and the calls are I/O bound
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompt_pairs))) as executor:
+            return list(executor.map(call, prompt_pairs))
+
+    def call_openai_batch(
+        self,
+        prompt_pairs: List[Tuple[str, str]],
+        model: str = "gpt-4o",
+        response_format: Optional[Dict] = None,
+        prompt_cache_key: Optional[str] = None,
+    ) -> List[str]:
+        """Run chat completions through the Batch API and wait for the results.
+
+        Half the price of real-time calls with a separate rate limit, but a batch may
+        take up to 24 hours, so only use this for offline generation. prompt_pairs are
+        (system_prompt, user_prompt) tuples; response contents come back in order.
+        """
+        if not prompt_pairs:
+            return []
+
+        lines = []
+        for i, (system_prompt, user_prompt) in enumerate(prompt_pairs):
+            body = {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+            }
+            if response_format:
+                body["response_format"] = response_format
+            if prompt_cache_key:
+                body["prompt_cache_key"] = prompt_cache_key
+            lines.append(orjson.dumps({
+                "custom_id": f"request_{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+
+        batch_input = self.client.files.create(
+            file=("batch_input.jsonl", b"\n".join(lines)),
+            purpose="batch",
         )
-        return response.choices[0].message.parsed
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        interval = self.BATCH_POLL_INTERVAL
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(interval)
+            interval = min(interval * 2, self.BATCH_MAX_POLL_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        contents: Dict[str, str] = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).content.splitlines():
+                result = orjson.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") == 200:
+                    contents[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+        missing = [i for i in range(len(prompt_pairs)) if f"request_{i}" not in contents]
+        if missing:
+            raise RuntimeError(f"Batch {batch.id} has no successful response for requests {missing}")
+        return [contents[f"request_{i}"] for i in range(len(prompt_pairs))]
 
     def call_openai_json(
         self,
         system_prompt: str,
         user_prompt: str,
         model: str = "gpt-4o",
-        max_retries: int = 3
+        max_retries: int = 3,
+        cache: bool = False
     ) -> Dict[str, Any]:
         """Call OpenAI API and parse JSON response with retry logic.
 
+        With cache=True responses go through the on-disk response cache.
+
         DEPRECATED: Prefer call_openai_structured() with Pydantic models.
         """
+        call = self._cached_call_openai if cache else self._call_openai_raw
         last_error = None
 
         for attempt in range(max_retries):
             try:
-                response, finish_reason = self._call_openai_raw(
+                response, finish_reason = call(
                     system_prompt=system_prompt,
                     user_prompt=user_prompt,
                     model=model,
@@ -164,7 +482,7 @@ class BaseGenerator:
 
                 # Check if response was truncated
                 if finish_reason == "length":
-                    print(f"    Warning: Response truncated (attempt {attempt + 1}/{max_retries})")
+                    logger.warning("    Warning: Response truncated (attempt %d/%d)", attempt + 1, max_retries)
                     # Try to repair truncated JSON
                     repaired = self._repair_truncated_json(response)
                     if repaired is not None:
@@ -174,11 +492,14 @@ class BaseGenerator:
                     continue
 
                 # Try to parse JSON
-                return json.loads(response)
+                return orjson.loads(response)
 
-            except json.JSONDecodeError as e:
-                print(f"    Warning: JSON parse error (attempt {attempt + 1}/{max_retries}): {str(e)[:100]}")
+            except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+                logger.warning("    Warning: JSON parse error (attempt %d/%d): %.100s", attempt + 1, max_retries, e)
                 last_error = str(e)
+                if cache:
+                    # Otherwise every retry would replay the same broken response
+                    self._evict_cached_response(system_prompt, user_prompt, model, {"type": "json_object"})
 
                 # Try to repair the JSON
                 if response:
@@ -188,8 +509,13 @@ class BaseGenerator:
 
                 continue
 
+            except APIError:
+                # Transient failures were already retried with backoff by the client;
+                # resending the whole prompt here would just hammer the API
+                raise
+
             except Exception as e:
-                print(f"    Warning: API error (attempt {attempt + 1}/{max_retries}): {str(e)[:100]}")
+                logger.warning("    Warning: API error (attempt %d/%d): %.100s", attempt + 1, max_retries, e)
                 last_error = str(e)
                 continue
 
@@ -201,18 +527,21 @@ class BaseGenerator:
         if not response:
             return None
 
-        # Try to parse as-is first
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            pass
+        repaired = response.rstrip()
+
+        # Only a response that ends in a closing bracket can be complete; a truncated
+        # one would just fail a full parse at its last byte
+        if repaired.endswith(('}', ']')):
+            try:
+                return orjson.loads(repaired)
+            except json.JSONDecodeError:
+                pass
 
         # Count open brackets and braces
-        open_braces = response.count('{') - response.count('}')
-        open_brackets = response.count('[') - response.count(']')
+        open_braces = repaired.count('{') - repaired.count('}')
+        open_brackets = repaired.count('[') - repaired.count(']')
 
         # Try to close them
-        repaired = response.rstrip()
 
         # Remove trailing comma if present
         if repaired.endswith(','):
@@ -223,8 +552,8 @@ class BaseGenerator:
         repaired += '}' * open_braces
 
         try:
-            result = json.loads(repaired)
-            print("    Successfully repaired truncated JSON")
+            result = orjson.loads(repaired)
+            logger.info("    Successfully repaired truncated JSON")
             return result
         except json.JSONDecodeError:
             pass
@@ -232,31 +561,20 @@ class BaseGenerator:
         # Try more aggressive repair: find last complete object
         # Look for the last complete item in arrays
         try:
-            # Find position of last complete object/array
+            # Find position of last complete object/array. The regex skips whole
+            # strings (including an unterminated trailing one) in C, so Python only
+            # sees the brackets.
             depth = 0
             last_complete = 0
-            in_string = False
-            escape_next = False
 
-            for i, char in enumerate(response):
-                if escape_next:
-                    escape_next = False
-                    continue
-                if char == '\\':
-                    escape_next = True
-                    continue
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    continue
-                if in_string:
-                    continue
-
-                if char in '{[':
+            for match in _JSON_STRUCTURE_RE.finditer(response):
+                char = match.group()
+                if char == '{' or char == '[':
                     depth += 1
-                elif char in '}]':
+                elif char == '}' or char == ']':
                     depth -= 1
                     if depth == 1:  # Just closed a top-level array item
-                        last_complete = i + 1
+                        last_complete = match.end()
 
             if last_complete > 0:
                 # Truncate to last complete item and close
@@ -267,8 +585,8 @@ class BaseGenerator:
                 truncated += ']' * remaining_brackets
                 truncated += '}' * remaining_braces
 
-                result = json.loads(truncated)
-                print(f"    Repaired JSON by truncating to last complete item")
+                result = orjson.loads(truncated)
+                logger.info("    Repaired JSON by truncating to last complete item")
                 return result
         except (json.JSONDecodeError, Exception):
             pass
@@ -284,19 +602,69 @@ class BaseGenerator:
         ])
 
     def save_json(self, data: Any, filename: str):
-        """Save data to a JSON file."""
+        """Save data to a JSON file.
+
+        The data is serialized here, so callers may keep mutating it, but the write
+        itself happens on a background thread. Call flush_writes() before relying
+        on the file being on disk; it also runs at interpreter exit, so a failed
+        write is never dropped silently.
+        """
         filepath = self.output_path / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"  Saved: {filename}")
+        # orjson emits UTF-8 bytes directly; output matches json.dump(indent=2, ensure_ascii=False)
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        future = self._shared_io_pool().submit(self._write_blob, filepath, payload)
+        with _pending_writes_lock:
+            _pending_writes.add(future)
+        future.add_done_callback(BaseGenerator._write_done)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _shared_io_pool() -> ThreadPoolExecutor:
+        """Background writer threads shared by every generator."""
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix="save_json")
+
+    @staticmethod
+    def _write_blob(filepath: Path, payload: bytes):
+        # Write a sibling temp file and swap it in, so an interrupted run never leaves a
+        # truncated file behind for the orchestrator's cache to pick up
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+        logger.info("  Saved: %s", filepath.name)
+
+    @staticmethod
+    def _write_done(future: Future):
+        # Report a failure as soon as it happens; flush_writes() raises it later
+        error = future.exception()
+        if error is None:
+            with _pending_writes_lock:
+                _pending_writes.discard(future)
+        else:
+            logger.error("  Failed to save JSON: %s", error)
+
+    @staticmethod
+    def flush_writes():
+        """Wait for pending save_json() writes, re-raising the first failure."""
+        with _pending_writes_lock:
+            pending = list(_pending_writes)
+            _pending_writes.clear()
+        for future in pending:
+            future.result()
 
     def get_base_system_prompt(self) -> str:
         """Get the base system prompt with language learning constraints."""
-        return f"""You are generating content for a language learning RPG that teaches {self.target_language} to speakers of {self.native_language}.
+        return self._build_base_system_prompt(self.target_language, self.native_language)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_base_system_prompt(target_language: str, native_language: str) -> str:
+        """Build the base system prompt once per language pair, shared by all generators."""
+        return f"""You are generating content for a language learning RPG that teaches {target_language} to speakers of {native_language}.
 
 CRITICAL REQUIREMENTS:
 1. ALL text that could be displayed to users MUST be in this bilingual format:
-   {{"native_language": "text in {self.native_language}", "target_language": "text in {self.target_language}"}}
+   {{"native_language": "text in {native_language}", "target_language": "text in {target_language}"}}
 
 2. Target proficiency range: A0 (absolute zero) to A2
    - A0: No prior knowledge, single words, basic greetings
@@ -311,29 +679,45 @@ CRITICAL REQUIREMENTS:
 6. All content must be appropriate for language learning
 
 PROFICIENCY LEVEL DETAILS:
-{json.dumps(self.PROFICIENCY_LEVELS, indent=2)}
+{BaseGenerator.PROFICIENCY_LEVELS_JSON}
 
 The learner should be able to progress naturally from knowing zero words to A2 fluency through gameplay."""
 
-    def validate_bilingual_text(self, obj: Any, path: str = "") -> List[str]:
-        """Validate that text fields have bilingual format. Returns list of errors."""
+    def validate_bilingual_text(self, obj: Any, path: str = "", max_errors: Optional[int] = None) -> List[str]:
+        """Validate that text fields have bilingual format. Returns list of errors.
+
+        With max_errors set, the walk stops as soon as that many errors are found.
+        """
         errors = []
+        # Iterative depth-first walk. Paths are kept as (parent, key, is_index) links
+        # and only rendered to strings when an error is recorded.
+        stack = [(obj, None)]
+
+        def render(link) -> str:
+            parts = []
+            while link is not None:
+                link, key, is_index = link
+                parts.append(f"[{key}]" if is_index else f".{key}")
+            return path + "".join(reversed(parts))
+
+        while stack:
+            node, link = stack.pop()
+
+            if isinstance(node, dict):
+                # Check if this is a bilingual text object
+                if "native_language" in node and "target_language" in node:
+                    if not isinstance(node["native_language"], str):
+                        errors.append(f"{render(link)}.native_language is not a string")
+                    if not isinstance(node["target_language"], str):
+                        errors.append(f"{render(link)}.target_language is not a string")
+                    if max_errors is not None and len(errors) >= max_errors:
+                        return errors[:max_errors]
+                else:
+                    # Pushed in reverse so errors come out in document order
+                    stack.extend((value, (link, key, False)) for key, value in reversed(node.items()))
 
-        if isinstance(obj, dict):
-            # Check if this is a bilingual text object
-            if "native_language" in obj and "target_language" in obj:
-                if not isinstance(obj["native_language"], str):
-                    errors.append(f"{path}.native_language is not a string")
-                if not isinstance(obj["target_language"], str):
-                    errors.append(f"{path}.target_language is not a string")
-            else:
-                # Recurse into dict
-                for key, value in obj.items():
-                    errors.extend(self.validate_bilingual_text(value, f"{path}.{key}"))
-
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                errors.extend(self.validate_bilingual_text(item, f"{path}[{i}]"))
+            elif isinstance(node, list):
+                stack.extend((item, (link, i, True)) for i, item in reversed(list(enumerate(node))))
 
         return errors
 
@@ -341,16 +725,20 @@ The learner should be able to progress naturally from knowing zero words to A2 f
         """Convert text to a URL-safe slug."""
         # Handle bilingual text objects
         if isinstance(text, dict):
-            text = text.get("native_language", text.get("target_language", ""))
+            try:
+                text = text["native_language"]
+            except KeyError:
+                text = text.get("target_language", "")
 
         if not isinstance(text, str):
             text = str(text)
 
         # Lowercase and replace spaces/special chars with underscores
-        slug = text.lower().strip()
-        slug = re.sub(r'[^a-z0-9]+', '_', slug)
-        slug = re.sub(r'_+', '_', slug)  # Collapse multiple underscores
-        slug = slug.strip('_')
+        text = text.lower()
+        if text.isascii():
+            slug = '_'.join(text.encode().translate(_SLUG_BYTES).decode().split())
+        else:
+            slug = _SLUG_RE.sub('_', text).strip('_')
         return slug[:30] if slug else "item"  # Limit length
 
     def assign_sequential_ids(
@@ -372,23 +760,16 @@ The learner should be able to progress naturally from knowing zero words to A2 f
         Returns:
             Items with deterministic IDs assigned
         """
-        result = []
-        for i, item in enumerate(items):
-            idx = start_index + i
-
+        slugify = self.slugify
+        for idx, item in enumerate(items, start_index):
             # Get name for slug if available
             name = item.get(name_field, "")
-            slug = self.slugify(name) if name else ""
+            slug = slugify(name) if name else ""
 
             # Generate deterministic ID: prefix_index_slug (e.g., quest_1_market_herbs)
-            if slug:
-                item["id"] = f"{prefix}_{idx}_{slug}"
-            else:
-                item["id"] = f"{prefix}_{idx}"
-
-            result.append(item)
+            item["id"] = f"{prefix}_{idx}_{slug}" if slug else f"{prefix}_{idx}"
 
-        return result
+        return items
 
     def build_id_mapping(
         self,
@@ -400,13 +781,11 @@ The learner should be able to progress naturally from knowing zero words to A2 f
 
         This allows us to update references after reassigning IDs.
         """
-        mapping = {}
-        for old_item, new_item in zip(old_items, new_items):
-            old_id = old_item.get("id", "")
-            new_id = new_item.get("id", "")
-            if old_id and new_id:
-                mapping[old_id] = new_id
-        return mapping
+        return {
+            old_id: new_id
+            for old_item, new_item in zip(old_items, new_items)
+            if (old_id := old_item.get("id")) and (new_id := new_item.get("id"))
+        }
 
     def update_references(
         self,
@@ -425,19 +804,32 @@ The learner should be able to progress naturally from knowing zero words to A2 f
         Returns:
             Data with updated references
         """
+        return self._update_references_copy(data, id_mapping, frozenset(reference_fields))
+
+    def _update_references_copy(self, data: Any, id_mapping: Dict[str, str], ref_set: frozenset) -> Any:
         if isinstance(data, dict):
             result = {}
             for key, value in data.items():
-                if key in reference_fields and isinstance(value, str):
+                if key in ref_set and isinstance(value, str):
                     # Update single ID reference
                     result[key] = id_mapping.get(value, value)
-                elif key in reference_fields and isinstance(value, list):
+                elif key in ref_set and isinstance(value, list):
                     # Update list of ID references
                     result[key] = [id_mapping.get(v, v) if isinstance(v, str) else v for v in value]
+                elif isinstance(value, (dict, list)):
+                    result[key] = self._update_references_copy(value, id_mapping, ref_set)
                 else:
-                    result[key] = self.update_references(value, id_mapping, reference_fields)
+                    result[key] = value
             return result
         elif isinstance(data, list):
-            return [self.update_references(item, id_mapping, reference_fields) for item in data]
+            return [
+                self._update_references_copy(item, id_mapping, ref_set)
+                if isinstance(item, (dict, list)) else item
+                for item in data
+            ]
         else:
             return data
+
+
+# Generators run on their own still get their writes waited on, and failures raised
+atexit.register(BaseGenerator.flush_writes)
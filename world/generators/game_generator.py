@@ -13,9 +13,13 @@ The game generator creates prompts describing each game, then the game agent
 generates the actual Lua code using the game engine API (loaded from prompt.txt).
 """
 
-from typing import Dict, Any, List
+import asyncio
+import functools
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from .base_generator import BaseGenerator
+from .models import MiniGameList
 
 
 class GameGenerator(BaseGenerator):
@@ -39,19 +43,47 @@ class GameGenerator(BaseGenerator):
         "rhythm_vocab: Tap words in rhythm with a beat",
         "gravity_drop: Catch falling words in the correct bucket",
     ]
+    GAME_CONCEPT_EXAMPLES_TEXT = "\n".join('- ' + ex for ex in GAME_CONCEPT_EXAMPLES)
+
+    # Lua generation requests in flight at once
+    MAX_PARALLEL_REQUESTS = 8
+
+    # Server-side prompt cache routing key shared by every Lua request
+    LUA_PROMPT_CACHE_KEY = "lua_game_generator"
+
+    # Most vocabulary words / grammar points passed to a single Lua request
+    MAX_PROMPT_VOCABULARY = 10
+    MAX_PROMPT_GRAMMAR = 5
+
+    # Games at these levels are simple enough for the cheaper spec model to code
+    SIMPLE_LANGUAGE_LEVELS = frozenset({"A0", "A0+"})
 
     def __init__(
         self,
         embedder,
         target_language: str,
         native_language: str,
-        output_path: Path
+        output_path: Path,
+        use_batch_api: bool = False,
+        use_response_cache: bool = False,
+        spec_model: Optional[str] = None,
+        code_model: Optional[str] = None
     ):
         super().__init__(embedder, target_language, native_language, output_path)
+        # Offline runs can trade latency (up to 24h) for half-price Batch API requests
+        self.use_batch_api = use_batch_api
+        # Replay earlier responses to identical prompts from the on-disk cache
+        self.use_response_cache = use_response_cache
+        # Planning specs is light structured-output work; Lua codegen gets the larger model
+        self.spec_model = spec_model or "gpt-5-mini"
+        self.code_model = code_model or "gpt-5"
         self.game_engine_api = self._load_game_engine_api()
+        self.lua_system_prompt = self._build_lua_system_prompt()
 
-    def _load_game_engine_api(self) -> str:
-        """Load the game engine API documentation from prompt.txt."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_game_engine_api() -> str:
+        """Load the game engine API documentation from prompt.txt (read once per process)."""
         # Look for prompt.txt in parent directories
         prompt_path = Path(__file__).parent.parent.parent / "prompt.txt"
         if prompt_path.exists():
@@ -83,22 +115,32 @@ class GameGenerator(BaseGenerator):
             print("    No games generated")
             return {"games": []}
 
-        # Generate Lua code for each game using the game agent
-        games_with_code = []
-        for i, spec in enumerate(game_specs):
-            print(f"    Generating Lua for game {i + 1}/{len(game_specs)}: {spec.get('name', {}).get('native_language', 'Unknown')}...")
-            lua_code = self._generate_lua_code(spec)
-            spec['lua_code'] = lua_code
-            games_with_code.append(spec)
+        # Specs that would send byte-identical Lua prompts share one generation
+        lua_prompts = [self._build_lua_prompts(spec) for spec in game_specs]
+        unique_specs = {}
+        for prompts, spec in zip(lua_prompts, game_specs):
+            unique_specs.setdefault(prompts, spec)
+        if len(unique_specs) < len(game_specs):
+            print(f"    {len(game_specs) - len(unique_specs)} game(s) share Lua with an identical spec")
+
+        # Generate Lua code for all games using the game agent
+        if self.use_batch_api:
+            lua_codes = self._generate_all_lua_code_batch(list(unique_specs.values()))
+        else:
+            lua_codes = asyncio.run(self._generate_all_lua_code(list(unique_specs.values())))
+        lua_by_prompts = dict(zip(unique_specs, lua_codes))
+        for prompts, spec in zip(lua_prompts, game_specs):
+            spec['lua_code'] = lua_by_prompts[prompts]
 
         # Assign IDs and convert indices to IDs
-        final_games = self._finalize_games(games_with_code)
+        final_games = self._finalize_games(game_specs)
 
+        games_by_location, games_by_npc, games_by_quest = self._build_indices(final_games)
         result = {
             "games": final_games,
-            "_games_by_location": self._group_by_location(final_games),
-            "_games_by_npc": self._group_by_npc(final_games),
-            "_games_by_quest": self._group_by_quest(final_games),
+            "_games_by_location": games_by_location,
+            "_games_by_npc": games_by_npc,
+            "_games_by_quest": games_by_quest,
         }
 
         self.save_json(result, "games.json")
@@ -127,7 +169,7 @@ Each game should:
 4. Be APPROPRIATE for the language level
 
 GAME CONCEPT INSPIRATION (create variations or entirely new concepts):
-{chr(10).join('- ' + ex for ex in self.GAME_CONCEPT_EXAMPLES)}
+{self.GAME_CONCEPT_EXAMPLES_TEXT}
 
 The games will be implemented as Lua code running in a simple 2D game engine.
 Keep mechanics achievable with: drawing shapes, text, mouse input, simple animation.
@@ -182,46 +224,115 @@ Target: {self.target_language}, Native: {self.native_language}
 Return as JSON: {{"games": [...]}}"""
 
         try:
+            # Use structured output
+            games_result = self.call_openai_structured(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                response_model=MiniGameList,
+                model=self.spec_model,
+                cache=self.use_response_cache,
+            )
+
+            # Convert Pydantic models to dicts
+            return [g.model_dump(mode="json") for g in games_result.games]
+        except Exception as e:
+            print(f"    Warning: Structured output failed, falling back to JSON: {e}")
+            # Fall back to JSON mode
             result = self.call_openai_json(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-                model="gpt-5",
+                model=self.spec_model,
+                cache=self.use_response_cache,
             )
             return result.get('games', [])
-        except Exception as e:
-            print(f"    Warning: Failed to generate game specs: {e}")
-            return []
 
-    def _generate_lua_code(self, game_spec: Dict[str, Any]) -> str:
-        """Generate Lua code for a game using the game agent (GPT-5)."""
-        game_prompt = game_spec.get('game_prompt', '')
-        name = game_spec.get('name', {}).get('native_language', 'Game')
-        vocabulary: str = game_spec.get('target_vocabulary', [])
-        grammar = game_spec.get('grammar_focus', [])
-        level = game_spec.get('language_level', 'A0')
+    async def _generate_all_lua_code(self, game_specs: List[Dict[str, Any]]) -> List[str]:
+        """Generate Lua code for every game spec, in order, with bounded concurrency.
 
-        # Format vocabulary for the prompt
-        vocab_str = str(vocabulary)
+        Each request is independent, so total latency is the slowest round-trip rather
+        than the sum of all of them. Rate-limit and server errors are retried with
+        backoff by the client; any other failure is raised once all requests finish.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_PARALLEL_REQUESTS)
 
-        grammar_str = str(grammar)
+        async def generate_one(i: int, spec: Dict[str, Any]) -> str:
+            async with semaphore:
+                print(f"    Generating Lua for game {i + 1}/{len(game_specs)}: {self._display_name(spec, 'Unknown')}...")
+                return await self._generate_lua_code_async(spec)
 
-        system_prompt = f"""You are a Lua game developer. You ONLY output valid Lua code, nothing else.
-No explanations, no markdown, no comments outside the code. Just pure Lua.
+        try:
+            results = await asyncio.gather(
+                *(generate_one(i, spec) for i, spec in enumerate(game_specs)),
+                return_exceptions=True,
+            )
+        finally:
+            # The client's connection pool is bound to this event loop, which ends here
+            await self.close_async_client()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _generate_lua_code_async(self, game_spec: Dict[str, Any]) -> str:
+        """Generate Lua code for a game using the game agent."""
+        system_prompt, user_prompt = self._build_lua_prompts(game_spec)
 
-{self.game_engine_api}
+        try:
+            call = self._acached_call_openai if self.use_response_cache else self._acall_openai_raw
+            response, _ = await call(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                model=self._lua_model(game_spec),
+                prompt_cache_key=self.LUA_PROMPT_CACHE_KEY,
+            )
+            return self._clean_lua_code(response)
 
-CRITICAL RULES:
-1. Output ONLY Lua code - no markdown, no explanations
-2. Use ONLY the API functions listed above
-3. Keep the game simple but polished
-4. Include clear visual feedback for correct/wrong answers
-5. The game must be completable and have a clear end state
-6. Use halt() when the game is won or lost
-7. Display text in {self.target_language} with {self.native_language} hints where helpful
-8. Make it visually appealing with colors and smooth animations"""
+        except Exception as e:
+            print(f"      Warning: Failed to generate Lua code: {e}")
+            raise
+
+    def _generate_all_lua_code_batch(self, game_specs: List[Dict[str, Any]]) -> List[str]:
+        """Generate Lua code for every game spec through the Batch API (half price, slow)."""
+        # A batch may only target one model, so submit one batch per model tier
+        indices_by_model = defaultdict(list)
+        for i, spec in enumerate(game_specs):
+            indices_by_model[self._lua_model(spec)].append(i)
+
+        lua_codes = [""] * len(game_specs)
+        for model, indices in indices_by_model.items():
+            print(f"    Submitting {len(indices)} Lua generation requests to {model} as a batch...")
+            responses = self.call_openai_batch(
+                [self._build_lua_prompts(game_specs[i]) for i in indices],
+                model=model,
+                prompt_cache_key=self.LUA_PROMPT_CACHE_KEY,
+            )
+            for i, response in zip(indices, responses):
+                lua_codes[i] = self._clean_lua_code(response)
+        return lua_codes
+
+    def _lua_model(self, game_spec: Dict[str, Any]) -> str:
+        """Pick the model for a game's Lua code: simple beginner games use the spec model."""
+        if game_spec.get('language_level', 'A0') in self.SIMPLE_LANGUAGE_LEVELS:
+            return self.spec_model
+        return self.code_model
+
+    def _build_lua_prompts(self, game_spec: Dict[str, Any]) -> Tuple[str, str]:
+        """Build the (system_prompt, user_prompt) pair for a game's Lua code."""
+        game_prompt = game_spec.get('game_prompt', '')
+        name = self._display_name(game_spec, 'Game')
+        vocabulary = game_spec.get('target_vocabulary') or []
+        grammar = game_spec.get('grammar_focus') or []
+        level = game_spec.get('language_level', 'A0')
+
+        # Compact "word (translation); ..." lists instead of Python reprs, capped so
+        # an oversized spec can't balloon every Lua request
+        vocab_str = self._format_bilingual_list(vocabulary[:self.MAX_PROMPT_VOCABULARY])
+        grammar_str = self._format_bilingual_list(grammar[:self.MAX_PROMPT_GRAMMAR])
 
         user_prompt = f"""Create a Lua game: {name}
 
+LANGUAGES: display text in {self.target_language} with {self.native_language} hints where helpful
+
 GAME DESCRIPTION:
 {game_prompt}
 
@@ -242,60 +353,54 @@ Requirements:
 
 Output ONLY the Lua code, nothing else."""
 
-        try:
-            # Use GPT-5 for better code generation
-            response = self.call_openai(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                model="gpt-5",
-            )
+        return self.lua_system_prompt, user_prompt
 
-            # Clean up the response - remove any markdown if present
-            code = response.strip()
-            if code.startswith("```lua"):
-                code = code[6:]
-            if code.startswith("```"):
-                code = code[3:]
-            if code.endswith("```"):
-                code = code[:-3]
+    def _build_lua_system_prompt(self) -> str:
+        """The Lua system prompt, identical for every game and language.
 
-            return code.strip()
+        Nothing game- or language-specific belongs here: an unchanged prompt prefix is
+        what lets the API serve the multi-KB engine docs from its prompt cache.
+        """
+        return f"""You are a Lua game developer. You ONLY output valid Lua code, nothing else.
+No explanations, no markdown, no comments outside the code. Just pure Lua.
 
-        except Exception as e:
-            print(f"      Warning: Failed to generate Lua code: {e}")
-            # Return a minimal fallback game
-            raise e
-
-    def _get_fallback_game(self, name: str,) -> str:
-        """Return a minimal fallback game if generation fails."""
-        return f'''-- Fallback game: {name}
-local score = 0
-local gameOver = false
-local message = ""
-
-function init()
-    message = "Click to start"
-end
-
-function update(dt)
-    if isMouseJustPressed() and not gameOver then
-        score = score + 10
-        if score >= 30 then
-            gameOver = true
-            message = "You win!"
-        end
-    end
-end
-
-function draw()
-    clear("#1a1a2e")
-    drawText("Score: " .. score, 10, 10, "#ffffff", 20)
-    drawText(message, getScreenWidth()/2 - 50, getScreenHeight()/2, "#00ff00", 24)
-    if gameOver then
-        drawText("Game Complete!", getScreenWidth()/2 - 70, getScreenHeight()/2 + 40, "#ffff00", 20)
-    end
-end
-'''
+{self.game_engine_api}
+
+CRITICAL RULES:
+1. Output ONLY Lua code - no markdown, no explanations
+2. Use ONLY the API functions listed above
+3. Keep the game simple but polished
+4. Include clear visual feedback for correct/wrong answers
+5. The game must be completable and have a clear end state
+6. Use halt() when the game is won or lost
+7. Display text in the languages given in the request
+8. Make it visually appealing with colors and smooth animations"""
+
+    @staticmethod
+    def _format_bilingual_list(entries: List[Any]) -> str:
+        """Format plain strings and bilingual dicts as "target (native); ..."."""
+        parts = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                target = entry.get('target_language', '')
+                native = entry.get('native_language', '')
+                parts.append(f"{target} ({native})" if native else target)
+            else:
+                parts.append(str(entry))
+        return "; ".join(parts) if parts else "none"
+
+    @staticmethod
+    def _clean_lua_code(response: str) -> str:
+        """Clean up the response - remove any markdown if present."""
+        code = response.strip()
+        if code.startswith("```lua"):
+            code = code[6:]
+        if code.startswith("```"):
+            code = code[3:]
+        if code.endswith("```"):
+            code = code[:-3]
+
+        return code.strip()
 
     def _finalize_games(self, games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Assign IDs and convert indices to actual IDs."""
@@ -337,44 +442,41 @@ end
 
         return finalized
 
-    def _group_by_location(self, games: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Group game IDs by trigger location."""
-        by_location = {}
-        for game in games:
-            if game.get('trigger_type') == 'location':
-                loc_id = game.get('trigger_id', '')
-                if loc_id not in by_location:
-                    by_location[loc_id] = []
-                by_location[loc_id].append(game['id'])
-        return by_location
-
-    def _group_by_npc(self, games: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Group game IDs by trigger NPC."""
-        by_npc = {}
-        for game in games:
-            if game.get('trigger_type') == 'npc':
-                npc_id = game.get('trigger_id', '')
-                if npc_id not in by_npc:
-                    by_npc[npc_id] = []
-                by_npc[npc_id].append(game['id'])
-        return by_npc
-
-    def _group_by_quest(self, games: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Group game IDs by related quest."""
-        by_quest = {}
+    def _build_indices(
+        self,
+        games: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], Dict[str, List[str]]]:
+        """Group game IDs by trigger location, trigger NPC and related quest in one pass."""
+        by_location = defaultdict(list)
+        by_npc = defaultdict(list)
+        by_quest = defaultdict(list)
         for game in games:
+            trigger_type = game.get('trigger_type')
+            if trigger_type == 'location':
+                by_location[game.get('trigger_id', '')].append(game['id'])
+            elif trigger_type == 'npc':
+                by_npc[game.get('trigger_id', '')].append(game['id'])
+
             quest_id = game.get('related_quest_id')
             if quest_id:
-                if quest_id not in by_quest:
-                    by_quest[quest_id] = []
                 by_quest[quest_id].append(game['id'])
-        return by_quest
+        return dict(by_location), dict(by_npc), dict(by_quest)
+
+    @staticmethod
+    def _display_name(obj: Dict[str, Any], fallback: str) -> str:
+        """Native-language name of a world object, else its id, else the fallback."""
+        name = obj.get('name')
+        if isinstance(name, dict):
+            native = name.get('native_language')
+            if native:
+                return native
+        return obj.get('id') or fallback
 
     def _format_quests_for_prompt(self) -> str:
         """Format quests with their vocabulary and grammar for the prompt."""
         lines = []
         for i, quest in enumerate(self.quests_list):
-            name = quest.get('name', {}).get('native_language', quest.get('id', f'Quest {i}'))
+            name = self._display_name(quest, f'Quest {i}')
             level = quest.get('language_level', 'A0')
             vocab = quest.get('target_vocabulary', [])
             grammar = quest.get('grammar_points', [])
@@ -395,7 +497,7 @@ end
         """Format locations with indices."""
         lines = []
         for i, loc in enumerate(self.locations):
-            name = loc.get('name', {}).get('native_language', loc.get('id', f'Location {i}'))
+            name = self._display_name(loc, f'Location {i}')
             level = loc.get('minimum_language_level', 'A0')
             lines.append(f"[{i}] {name} (level: {level})")
         return "\n".join(lines)
@@ -404,7 +506,7 @@ end
         """Format NPCs with indices."""
         lines = []
         for i, npc in enumerate(self.npcs_list):
-            name = npc.get('name', {}).get('native_language', npc.get('id', f'NPC {i}'))
+            name = self._display_name(npc, f'NPC {i}')
             loc_id = npc.get('location_id', 'unknown')
             lines.append(f"[{i}] {name} @ {loc_id}")
         return "\n".join(lines)
@@ -147,33 +147,36 @@ Native language: {self.native_language}"""
         items = self.assign_sequential_ids(items, prefix="item", start_index=1, name_field="name")
         items_data['items'] = items
 
-        # Validate and fix location_ids
-        valid_location_ids = {loc['id'] for loc in world_map.get('locations', [])}
+        # Validate and fix location_ids. Lookups are built once, in map order, so
+        # fuzzy matches and the fallback don't depend on set iteration order.
+        location_ids = [loc['id'] for loc in world_map.get('locations', [])]
+        valid_location_ids = set(location_ids)
+        normalized_location_ids = {loc_id.lower(): loc_id for loc_id in location_ids}
+        fallback_location_id = location_ids[0] if location_ids else None
         valid_items = []
         removed_count = 0
 
         for item in items:
-            if item.get('location_id') in valid_location_ids:
+            loc_id = item.get('location_id') or ''
+            if loc_id in valid_location_ids:
                 valid_items.append(item)
+                continue
+
+            # Try a case-insensitive match, then a partial match
+            match = normalized_location_ids.get(loc_id.lower()) or next(
+                (valid_id for valid_id in location_ids if loc_id in valid_id or valid_id in loc_id),
+                None
+            )
+            if match:
+                item['location_id'] = match
+                valid_items.append(item)
+            elif fallback_location_id:
+                # Assign to first location as fallback
+                item['location_id'] = fallback_location_id
+                valid_items.append(item)
+                print(f"    Warning: Fixed invalid location for item '{item.get('id')}'")
             else:
-                # Try to find a matching location by partial match
-                found = False
-                loc_id = item.get('location_id', '')
-                for valid_id in valid_location_ids:
-                    if loc_id in valid_id or valid_id in loc_id:
-                        item['location_id'] = valid_id
-                        valid_items.append(item)
-                        found = True
-                        break
-
-                if not found:
-                    # Assign to first location as fallback
-                    if valid_location_ids:
-                        item['location_id'] = list(valid_location_ids)[0]
-                        valid_items.append(item)
-                        print(f"    Warning: Fixed invalid location for item '{item.get('id')}'")
-                    else:
-                        removed_count += 1
+                removed_count += 1
 
         items_data['items'] = valid_items
 
@@ -193,7 +196,7 @@ Native language: {self.native_language}"""
         print(f"  Generated {len(valid_items)} items across {len(items_by_location)} locations")
 
         # Validate bilingual text
-        errors = self.validate_bilingual_text(items_data)
+        errors = self.validate_bilingual_text(items_data, max_errors=3)
         if errors:
             print(f"  Warning: Bilingual format issues found in items: {errors[:3]}...")
 
@@ -14,7 +14,16 @@ Each level has:
 - Flexible skill pool (any N of these at threshold Y)
 """
 
-from typing import Dict, Any, List, Set, Tuple
+from typing import Dict, Any, List, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None  # Optional: can_advance_batch falls back to NumPy reductions
+    prange = range
+
 from .base_generator import BaseGenerator
 from .trigger_validator import TriggerValidator
 from .models import (
@@ -25,6 +34,45 @@ from .models import (
 )
 
 
+def _can_advance_rows(
+    skill_matrix: np.ndarray,
+    core_idx: np.ndarray,
+    core_min: np.ndarray,
+    flex_idx: np.ndarray,
+    flex_threshold: int,
+    flex_required: int,
+    min_points: int
+) -> np.ndarray:
+    """Row-by-row progression check; compiled with Numba when it is installed."""
+    n_users, n_skills = skill_matrix.shape
+    result = np.zeros(n_users, dtype=np.bool_)
+    for row in prange(n_users):
+        total = 0
+        for col in range(n_skills):
+            total += skill_matrix[row, col]
+        if total < min_points:
+            continue
+
+        core_ok = True
+        for k in range(core_idx.shape[0]):
+            if skill_matrix[row, core_idx[k]] < core_min[k]:
+                core_ok = False
+                break
+        if not core_ok:
+            continue
+
+        qualifying = 0
+        for k in range(flex_idx.shape[0]):
+            if skill_matrix[row, flex_idx[k]] >= flex_threshold:
+                qualifying += 1
+        result[row] = qualifying >= flex_required
+    return result
+
+
+# One fused pass per user, parallel across users (rows are written independently)
+_can_advance_kernel = njit(parallel=True, cache=True)(_can_advance_rows) if njit else None
+
+
 class LevelProgressionGenerator(BaseGenerator):
     """Generates deterministic level progression requirements."""
 
@@ -89,6 +137,23 @@ class LevelProgressionGenerator(BaseGenerator):
         skills_by_level = skills.get('_skills_by_level', {})
         skill_ids = set(skills.get('_skill_ids', []))
 
+        # Index (difficulty, category) by skill ID once, with enum difficulties
+        # normalized to plain strings; the first skill with a given ID wins
+        skill_index = {}
+        for skill in skill_list:
+            if 'id' in skill and skill['id'] not in skill_index:
+                difficulty = skill.get('difficulty', 'A0')
+                if isinstance(difficulty, LanguageLevel):
+                    difficulty = difficulty.value
+                skill_index[skill['id']] = (difficulty, skill.get('category', ''))
+
+        # Skill IDs up to and including each level, built in one prefix scan
+        cumulative_skill_ids = {}
+        running_skill_ids = []
+        for level in self.LEVEL_ORDER:
+            running_skill_ids.extend(skills_by_level.get(level.value, []))
+            cumulative_skill_ids[level.value] = tuple(running_skill_ids)
+
         # Create validator
         validator = TriggerValidator(valid_skill_ids=skill_ids)
 
@@ -102,8 +167,8 @@ class LevelProgressionGenerator(BaseGenerator):
             requirement = self._generate_requirement(
                 from_level,
                 to_level,
-                skill_list,
-                skills_by_level
+                skill_index,
+                cumulative_skill_ids
             )
 
             # Validate requirement
@@ -141,39 +206,28 @@ class LevelProgressionGenerator(BaseGenerator):
         self,
         from_level: LanguageLevel,
         to_level: LanguageLevel,
-        skills: List[Dict[str, Any]],
-        skills_by_level: Dict[str, List[str]]
+        skill_index: Dict[str, Tuple[str, str]],
+        cumulative_skill_ids: Dict[str, Tuple[str, ...]]
     ) -> LevelProgressionRequirement:
         """Generate requirement for a specific level transition."""
 
         key = f"{from_level.value}->{to_level.value}"
         base_req = self.LEVEL_BASE_REQUIREMENTS.get(key, self.LEVEL_BASE_REQUIREMENTS["A0->A0+"])
 
-        # Get skills up to and including current level
-        relevant_levels = []
-        for level in self.LEVEL_ORDER:
-            relevant_levels.append(level.value)
-            if level == from_level:
-                break
-
-        # Collect skills from relevant levels
-        relevant_skill_ids = []
-        for level in relevant_levels:
-            relevant_skill_ids.extend(skills_by_level.get(level, []))
+        # Skills from levels up to and including the current one
+        relevant_skill_ids = cumulative_skill_ids[from_level.value]
 
         # Categorize skills
         core_skills = []
         flexible_skills = []
 
         for skill_id in relevant_skill_ids:
-            skill = self._find_skill_by_id(skills, skill_id)
+            skill = skill_index.get(skill_id)
             if not skill:
                 continue
 
             # Core skills are vocabulary and grammar at lower levels
-            skill_level = skill.get('difficulty', 'A0')
-            level_str = skill_level.value if hasattr(skill_level, 'value') else skill_level
-            category = skill.get('category', '')
+            level_str, category = skill
 
             # Skills at the current level are flexible, lower levels are core
             if level_str == from_level.value:
@@ -212,25 +266,14 @@ class LevelProgressionGenerator(BaseGenerator):
             description=base_req['description']
         )
 
-    def _find_skill_by_id(
-        self,
-        skills: List[Dict[str, Any]],
-        skill_id: str
-    ) -> Dict[str, Any]:
-        """Find a skill by its ID."""
-        for skill in skills:
-            if skill.get('id') == skill_id:
-                return skill
-        return {}
-
     def _requirement_to_dict(
         self,
         requirement: LevelProgressionRequirement
     ) -> Dict[str, Any]:
         """Convert a requirement to a serializable dict."""
         return {
-            "from_level": requirement.from_level.value if hasattr(requirement.from_level, 'value') else requirement.from_level,
-            "to_level": requirement.to_level.value if hasattr(requirement.to_level, 'value') else requirement.to_level,
+            "from_level": requirement.from_level.value,
+            "to_level": requirement.to_level.value,
             "minimum_total_skill_points": requirement.minimum_total_skill_points,
             "required_skill_thresholds": [
                 {"skill_id": t.skill_id, "minimum_level": t.minimum_level}
@@ -254,6 +297,25 @@ class LevelProgressionEvaluator:
     def __init__(self, config: LevelProgressionConfig):
         self.config = config
 
+    @property
+    def config(self) -> LevelProgressionConfig:
+        return self._config
+
+    @config.setter
+    def config(self, config: LevelProgressionConfig) -> None:
+        self._config = config
+
+        # Requirement and (skill_id, minimum_level) pairs per from_level; the
+        # first requirement for a level wins, as in config.get_requirement()
+        self._req_by_level: Dict[LanguageLevel, LevelProgressionRequirement] = {}
+        self._core_thresholds: Dict[LanguageLevel, Tuple[Tuple[str, int], ...]] = {}
+        for requirement in config.requirements:
+            if requirement.from_level not in self._req_by_level:
+                self._req_by_level[requirement.from_level] = requirement
+                self._core_thresholds[requirement.from_level] = tuple(
+                    (t.skill_id, t.minimum_level) for t in requirement.required_skill_thresholds
+                )
+
     def can_advance(
         self,
         current_level: LanguageLevel,
@@ -269,7 +331,7 @@ class LevelProgressionEvaluator:
         Returns:
             Tuple of (can_advance: bool, reasons: List[str])
         """
-        requirement = self.config.get_requirement(current_level)
+        requirement = self._req_by_level.get(current_level)
         if not requirement:
             return False, ["No progression available from this level"]
 
@@ -283,11 +345,11 @@ class LevelProgressionEvaluator:
             )
 
         # Check required skill thresholds
-        for threshold in requirement.required_skill_thresholds:
-            current = skill_levels.get(threshold.skill_id, 0)
-            if current < threshold.minimum_level:
+        for skill_id, minimum_level in self._core_thresholds[requirement.from_level]:
+            current = skill_levels.get(skill_id, 0)
+            if current < minimum_level:
                 reasons.append(
-                    f"Skill '{threshold.skill_id}' needs level {threshold.minimum_level}, have {current}"
+                    f"Skill '{skill_id}' needs level {minimum_level}, have {current}"
                 )
 
         # Check flexible requirements
@@ -307,6 +369,72 @@ class LevelProgressionEvaluator:
         can_advance = len(reasons) == 0
         return can_advance, reasons
 
+    def can_advance_batch(
+        self,
+        current_level: LanguageLevel,
+        skill_ids: Sequence[str],
+        skill_matrix: np.ndarray
+    ) -> np.ndarray:
+        """
+        Check many users at once against the requirement for current_level.
+
+        Args:
+            current_level: Language level shared by every user in the batch
+            skill_ids: Skill ID for each column of skill_matrix
+            skill_matrix: (n_users, n_skills) array of skill levels (0-100)
+
+        Returns:
+            Boolean array with one entry per user, matching can_advance()[0].
+            Skills without a column count as level 0, as in can_advance.
+        """
+        skill_matrix = np.asarray(skill_matrix)
+        n_users = skill_matrix.shape[0]
+        requirement = self._req_by_level.get(current_level)
+        if not requirement:
+            return np.zeros(n_users, dtype=bool)
+
+        column_by_skill = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+
+        # Required thresholds; a skill with no column is at level 0
+        core_idx = []
+        core_min = []
+        for skill_id, minimum_level in self._core_thresholds[requirement.from_level]:
+            column = column_by_skill.get(skill_id)
+            if column is not None:
+                core_idx.append(column)
+                core_min.append(minimum_level)
+            elif minimum_level > 0:
+                return np.zeros(n_users, dtype=bool)
+
+        # Flexible pool: count skills at or above the flexible threshold
+        flex_idx = []
+        flex_required = 0
+        if requirement.flexible_skill_count > 0:
+            flex_idx = [column_by_skill[skill_id] for skill_id in requirement.flexible_skill_pool
+                        if skill_id in column_by_skill]
+            flex_required = requirement.flexible_skill_count
+            if requirement.flexible_threshold <= 0:
+                flex_required -= len(requirement.flexible_skill_pool) - len(flex_idx)
+
+        if _can_advance_kernel is not None:
+            return _can_advance_kernel(
+                skill_matrix,
+                np.asarray(core_idx, dtype=np.int64),
+                np.asarray(core_min, dtype=np.int64),
+                np.asarray(flex_idx, dtype=np.int64),
+                requirement.flexible_threshold,
+                flex_required,
+                requirement.minimum_total_skill_points,
+            )
+
+        can = skill_matrix.sum(axis=1) >= requirement.minimum_total_skill_points
+        if core_idx:
+            can &= (skill_matrix[:, core_idx] >= np.asarray(core_min)).all(axis=1)
+        if flex_required > 0:
+            qualifying = (skill_matrix[:, flex_idx] >= requirement.flexible_threshold).sum(axis=1)
+            can &= qualifying >= flex_required
+        return can
+
     def get_progress(
         self,
         current_level: LanguageLevel,
@@ -321,7 +449,7 @@ class LevelProgressionEvaluator:
         - flexible_skills_progress: count / required
         - overall_percentage: estimated % to next level
         """
-        requirement = self.config.get_requirement(current_level)
+        requirement = self._req_by_level.get(current_level)
         if not requirement:
             return {"error": "No progression available"}
 
@@ -330,17 +458,17 @@ class LevelProgressionEvaluator:
         # Core skill progress
         core_progress = []
         core_met = 0
-        for threshold in requirement.required_skill_thresholds:
-            current = skill_levels.get(threshold.skill_id, 0)
-            progress = min(100, int((current / threshold.minimum_level) * 100)) if threshold.minimum_level > 0 else 100
+        for skill_id, minimum_level in self._core_thresholds[requirement.from_level]:
+            current = skill_levels.get(skill_id, 0)
+            progress = min(100, int((current / minimum_level) * 100)) if minimum_level > 0 else 100
             core_progress.append({
-                "skill_id": threshold.skill_id,
+                "skill_id": skill_id,
                 "current": current,
-                "required": threshold.minimum_level,
+                "required": minimum_level,
                 "progress_percent": progress,
-                "met": current >= threshold.minimum_level
+                "met": current >= minimum_level
             })
-            if current >= threshold.minimum_level:
+            if current >= minimum_level:
                 core_met += 1
 
         # Flexible skill progress
@@ -91,7 +91,7 @@ Ensure all text fields use the bilingual format shown above."""
         )
 
         # Validate
-        errors = self.validate_bilingual_text(lore)
+        errors = self.validate_bilingual_text(lore, max_errors=3)
         if errors:
             print(f"  Warning: Bilingual format issues found: {errors[:3]}...")
 
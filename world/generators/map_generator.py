@@ -4,6 +4,7 @@ Map Generator
 Generates the world map with locations appropriate for language learning progression.
 """
 
+from collections import defaultdict
 from typing import Dict, Any
 from .base_generator import BaseGenerator
 
@@ -113,56 +114,59 @@ Native language: {self.native_language}"""
         locations = world_map.get('locations', [])
         locations = self.assign_sequential_ids(locations, prefix="loc", start_index=1, name_field="name")
 
-        # Convert region_index to region_id and connection_indices to connection IDs
+        # Stage the index fields in one pass, then write back only the derived fields
         location_ids = [loc['id'] for loc in locations]
-        for loc in locations:
+        region_idxs = [loc.pop('region_index', 0) for loc in locations]
+        conn_idxs_list = [loc.pop('connection_indices', []) for loc in locations]
+
+        default_region_id = region_ids[0] if region_ids else "region_1"
+        n_regions = len(region_ids)
+        n_locations = len(location_ids)
+        # Location IDs per minimum level, for the starting-location lookup below
+        locations_by_level = defaultdict(list)
+        for loc, region_idx, conn_indices in zip(locations, region_idxs, conn_idxs_list):
             # Convert region_index to region_id
-            region_idx = loc.pop('region_index', 0)
-            if 0 <= region_idx < len(region_ids):
-                loc['region_id'] = region_ids[region_idx]
-            else:
-                loc['region_id'] = region_ids[0] if region_ids else "region_1"
+            loc['region_id'] = region_ids[region_idx] if 0 <= region_idx < n_regions else default_region_id
 
             # Convert connection_indices to connection IDs
-            conn_indices = loc.pop('connection_indices', [])
-            loc['connections'] = []
-            for idx in conn_indices:
-                if isinstance(idx, int) and 0 <= idx < len(location_ids):
-                    loc['connections'].append(location_ids[idx])
+            loc['connections'] = [
+                location_ids[idx] for idx in conn_indices
+                if isinstance(idx, int) and 0 <= idx < n_locations
+            ]
 
             # Initialize empty lists for NPCs and items (to be filled later)
             loc['npcs'] = []
             loc['available_items'] = []
 
+            locations_by_level[loc.get('minimum_language_level', 'A0')].append(loc['id'])
+
         world_map['locations'] = locations
 
         # Build connections list from location connections
         connections = []
         seen_pairs = set()
         for loc in locations:
+            loc_id = loc['id']
             for conn_id in loc.get('connections', []):
-                pair = tuple(sorted([loc['id'], conn_id]))
+                # Order the pair with one comparison instead of sorting a temporary list
+                pair = (loc_id, conn_id) if loc_id < conn_id else (conn_id, loc_id)
                 if pair not in seen_pairs:
                     seen_pairs.add(pair)
                     connections.append({
-                        "from_location": loc['id'],
+                        "from_location": loc_id,
                         "to_location": conn_id,
                         "bidirectional": True
                     })
         world_map['connections'] = connections
 
         # Set starting location to first A0 location
-        starting_loc = None
-        for loc in locations:
-            if loc.get('minimum_language_level') == 'A0':
-                starting_loc = loc['id']
-                break
-        world_map['starting_location'] = starting_loc or (location_ids[0] if location_ids else None)
+        a0_locations = locations_by_level.get('A0')
+        world_map['starting_location'] = a0_locations[0] if a0_locations else (location_ids[0] if location_ids else None)
 
         print(f"  Generated {len(locations)} locations in {len(regions)} regions")
 
         # Validate
-        errors = self.validate_bilingual_text(world_map)
+        errors = self.validate_bilingual_text(world_map, max_errors=3)
         if errors:
             print(f"  Warning: Bilingual format issues found in map: {errors[:3]}...")
 
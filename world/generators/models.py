@@ -567,4 +567,8 @@ class MiniGame(BaseModel):
     )
 
     # Rewards
-    item_reward: int
+    skill_points: int = Field(description="Points awarded (10-30 based on difficulty)")
+
+
+class MiniGameList(BaseModel):
+    games: List[MiniGame]
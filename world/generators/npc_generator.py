@@ -172,9 +172,8 @@ class NPCGenerator(BaseGenerator):
 
         valid_location_ids = {loc['id'] for loc in locations}
 
-        # Generate NPCs for each language level
-        all_npcs = []
-        npc_counter = 1
+        # Build one prompt per language level, then generate all levels concurrently
+        level_jobs = []
 
         for level in self.LANGUAGE_LEVELS:
             level_locations = locations_by_level.get(level, [])
@@ -188,17 +187,35 @@ class NPCGenerator(BaseGenerator):
             if not level_locations:
                 continue
 
-            print(f"    Generating NPCs for level {level}...")
-
             locations_summary = "\n".join([
                 f"- {loc['id']}: {loc.get('name', {})} (Topics: {loc.get('language_topics', [])})"
                 for loc in level_locations
             ])
 
-            # Generate batch for this level
-            level_npcs = self._generate_npcs_for_level(
-                lore, level, locations_summary, vocab_content, level_locations
-            )
+            level_jobs.append((level, level_locations, (
+                self._build_system_prompt_for_level(level),
+                self._build_user_prompt_for_level(
+                    lore, level, locations_summary, vocab_content, level_locations
+                ),
+            )))
+
+        print(f"    Generating NPCs for levels {', '.join(job[0] for job in level_jobs)}...")
+        level_results = self.call_openai_many(
+            [prompts for _, _, prompts in level_jobs],
+            response_model=NPCList,
+            return_exceptions=True,
+        )
+
+        all_npcs = []
+        npc_counter = 1
+
+        for (level, level_locations, _), npcs_result in zip(level_jobs, level_results):
+            if isinstance(npcs_result, Exception):
+                print(f"      Warning: Failed to generate NPCs for level {level}: {npcs_result}")
+                # Try with smaller batch
+                level_npcs = self._generate_npcs_fallback(lore, level, level_locations)
+            else:
+                level_npcs = [npc.model_dump() for npc in npcs_result.npcs]
 
             # Assign IDs and validate locations
             for npc in level_npcs:
@@ -248,39 +265,13 @@ class NPCGenerator(BaseGenerator):
         print(f"  Generated {len(relationships)} relationships")
 
         # Validate bilingual text
-        errors = self.validate_bilingual_text(npcs_data)
+        errors = self.validate_bilingual_text(npcs_data, max_errors=3)
         if errors:
             print(f"  Warning: Bilingual format issues found in NPCs: {errors[:3]}...")
 
         self.save_json(npcs_data, "npcs.json")
         return npcs_data
 
-    def _generate_npcs_for_level(
-        self,
-        lore: Dict[str, Any],
-        level: str,
-        locations_summary: str,
-        vocab_content: str,
-        level_locations: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Generate NPCs for a specific language level."""
-        system_prompt = self._build_system_prompt_for_level(level)
-        user_prompt = self._build_user_prompt_for_level(
-            lore, level, locations_summary, vocab_content, level_locations
-        )
-
-        try:
-            npcs_result = self.call_openai_structured(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                response_model=NPCList
-            )
-            return [npc.model_dump() for npc in npcs_result.npcs]
-        except Exception as e:
-            print(f"      Warning: Failed to generate NPCs for level {level}: {e}")
-            # Try with smaller batch
-            return self._generate_npcs_fallback(lore, level, level_locations)
-
     def _generate_npcs_fallback(
         self,
         lore: Dict[str, Any],
@@ -554,7 +545,7 @@ The prompt should cover:
 Make it 400-600 words, highly specific, and actionable for an AI agent.
 Remember: IN-CHARACTER ONLY. No meta-language about teaching."""
 
-        return self.call_openai(
+        return self._call_openai_raw(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-        )
+        )[0]
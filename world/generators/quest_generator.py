@@ -224,7 +224,7 @@ class QuestGenerator(BaseGenerator):
         }
 
         # Validate bilingual text
-        bilingual_errors = self.validate_bilingual_text(final_data)
+        bilingual_errors = self.validate_bilingual_text(final_data, max_errors=3)
         if bilingual_errors:
             print(f"  Warning: Bilingual format issues found: {bilingual_errors[:3]}...")
 
@@ -4,10 +4,16 @@ World Orchestrator
 Coordinates all generators to create a complete RPG world.
 """
 
-import json
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import orjson
+
+from .base_generator import BaseGenerator
 from .lore_generator import LoreGenerator
 from .npc_generator import NPCGenerator
 from .map_generator import MapGenerator
@@ -20,6 +26,43 @@ from .trigger_generator import TriggerGenerator
 from .level_progression import LevelProgressionGenerator
 
 
+class _ThreadPrefixedStream:
+    """Wraps a text stream, prefixing each line written from matching threads."""
+
+    def __init__(self, stream, thread_name_prefix: str, prefix: str):
+        self._stream = stream
+        self._thread_name_prefix = thread_name_prefix
+        self._prefix = prefix
+        # print() writes the text and the newline separately, so line starts
+        # are tracked across writes
+        self._at_line_start = True
+
+    def write(self, text: str) -> int:
+        if text and threading.current_thread().name.startswith(self._thread_name_prefix):
+            parts = []
+            for line in text.splitlines(keepends=True):
+                if self._at_line_start:
+                    parts.append(self._prefix)
+                parts.append(line)
+                self._at_line_start = line.endswith("\n")
+            text = "".join(parts)
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def _prefixed_thread_output(thread_name_prefix: str, prefix: str):
+    """Prefix stdout lines printed from threads named thread_name_prefix*."""
+    original = sys.stdout
+    sys.stdout = _ThreadPrefixedStream(original, thread_name_prefix, prefix)
+    try:
+        yield
+    finally:
+        sys.stdout = original
+
+
 class WorldOrchestrator:
     """Orchestrates the generation of a complete RPG world."""
 
@@ -28,21 +71,25 @@ class WorldOrchestrator:
         embedder,
         target_language: str,
         native_language: str,
-        output_path: Path
+        output_path: Path,
+        use_batch_api: bool = False,
+        use_response_cache: bool = False
     ):
         self.embedder = embedder
         self.target_language = target_language
         self.native_language = native_language
         self.output_path = output_path
+        self.use_batch_api = use_batch_api
+        self.use_response_cache = use_response_cache
 
     def _load_cached(self, filename: str) -> Optional[Dict[str, Any]]:
         """Load cached JSON file if it exists."""
         filepath = self.output_path / filename
         if filepath.exists():
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                # orjson parses the UTF-8 bytes directly, without a decode pass
+                return orjson.loads(filepath.read_bytes())
+            except (orjson.JSONDecodeError, IOError):
                 return None
         return None
 
@@ -82,37 +129,13 @@ class WorldOrchestrator:
             )
             world_data['map'] = map_gen.generate(world_data['lore'])
 
-        # Step 3: Generate or load NPCs
-        print("  [3/10] NPCs...")
-        cached_npcs = self._load_cached("npcs.json")
-        if cached_npcs:
-            print("    Using cached npcs.json")
-            world_data['npcs'] = cached_npcs
-        else:
-            print("    Generating NPCs...")
-            npc_gen = NPCGenerator(
-                embedder=self.embedder,
-                target_language=self.target_language,
-                native_language=self.native_language,
-                output_path=self.output_path
-            )
-            world_data['npcs'] = npc_gen.generate(world_data['lore'], world_data['map'])
-
-        # Step 4: Generate or load items
-        print("  [4/10] Items...")
-        cached_items = self._load_cached("items.json")
-        if cached_items:
-            print("    Using cached items.json")
-            world_data['items'] = cached_items
-        else:
-            print("    Generating items...")
-            item_gen = ItemGenerator(
-                embedder=self.embedder,
-                target_language=self.target_language,
-                native_language=self.native_language,
-                output_path=self.output_path
-            )
-            world_data['items'] = item_gen.generate(world_data['lore'], world_data['map'])
+        # Steps 3 and 4: NPCs and items both only need lore and the map, so their
+        # LLM calls overlap
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            npcs_future = executor.submit(self._generate_npcs, world_data)
+            items_future = executor.submit(self._generate_items, world_data)
+            world_data['npcs'] = npcs_future.result()
+            world_data['items'] = items_future.result()
 
         # Step 5: Generate or load quests
         print("  [5/10] Quests...")
@@ -135,105 +158,160 @@ class WorldOrchestrator:
                 world_data['items']
             )
 
-        # Step 6: Generate or load mini-games
-        print("  [6/10] Mini-games...")
-        cached_games = self._load_cached("games.json")
-        if cached_games:
-            print("    Using cached games.json")
-            world_data['games'] = cached_games
-        else:
-            print("    Generating mini-games...")
-            game_gen = GameGenerator(
-                embedder=self.embedder,
-                target_language=self.target_language,
-                native_language=self.native_language,
-                output_path=self.output_path
-            )
-            world_data['games'] = game_gen.generate(
-                world_data['map'],
-                world_data['npcs'],
-                world_data['items'],
-                world_data['quests']
-            )
+        # Step 6: Mini-games are the slowest step and nothing after this depends on
+        # them, so they generate in the background while steps 7-10 run. Their
+        # progress lines are prefixed so they can be told apart from steps 7-10
+        with _prefixed_thread_output("games", "[games] "), \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="games") as games_executor:
+            games_future = games_executor.submit(self._generate_games, dict(world_data))
+            games_future.add_done_callback(self._report_games_failure)
 
-        # Step 7: Generate or load tutor data
-        print("  [7/10] Tutor data...")
-        cached_tutor = self._load_cached("tutor.json")
-        if cached_tutor:
-            print("    Using cached tutor.json")
-            world_data['tutor'] = cached_tutor
-        else:
-            print("    Generating tutor data...")
-            tutor_gen = TutorGenerator(
-                embedder=self.embedder,
-                target_language=self.target_language,
-                native_language=self.native_language,
-                output_path=self.output_path
-            )
-            world_data['tutor'] = tutor_gen.generate(
-                world_data['quests'],
-                world_data['items'],
-                world_data['npcs']
-            )
+            # Step 7: Generate or load tutor data
+            print("  [7/10] Tutor data...")
+            cached_tutor = self._load_cached("tutor.json")
+            if cached_tutor:
+                print("    Using cached tutor.json")
+                world_data['tutor'] = cached_tutor
+            else:
+                print("    Generating tutor data...")
+                tutor_gen = TutorGenerator(
+                    embedder=self.embedder,
+                    target_language=self.target_language,
+                    native_language=self.native_language,
+                    output_path=self.output_path
+                )
+                world_data['tutor'] = tutor_gen.generate(
+                    world_data['quests'],
+                    world_data['items'],
+                    world_data['npcs']
+                )
+
+            # Step 8: Generate or load language skills
+            print("  [8/10] Language skills...")
+            cached_skills = self._load_cached("skills.json")
+            if cached_skills:
+                print("    Using cached skills.json")
+                world_data['skills'] = cached_skills
+            else:
+                print("    Generating language skills...")
+                # Get grammar curriculum from tutor data
+                grammar_curriculum = world_data['tutor'].get('grammar_by_level', {})
+                skill_gen = SkillGenerator(
+                    embedder=self.embedder,
+                    target_language=self.target_language,
+                    native_language=self.native_language,
+                    output_path=self.output_path
+                )
+                world_data['skills'] = skill_gen.generate(
+                    world_data['lore'],
+                    grammar_curriculum
+                )
+
+            # Step 9: Generate or load skill progression triggers
+            print("  [9/10] Skill progression triggers...")
+            cached_triggers = self._load_cached("triggers.json")
+            if cached_triggers:
+                print("    Using cached triggers.json")
+                world_data['triggers'] = cached_triggers
+            else:
+                print("    Generating skill progression triggers...")
+                trigger_gen = TriggerGenerator(
+                    embedder=self.embedder,
+                    target_language=self.target_language,
+                    native_language=self.native_language,
+                    output_path=self.output_path
+                )
+                world_data['triggers'] = trigger_gen.generate(
+                    world_data['skills'],
+                    world_data['quests'],
+                    world_data['npcs'],
+                )
 
-        # Step 8: Generate or load language skills
-        print("  [8/10] Language skills...")
-        cached_skills = self._load_cached("skills.json")
-        if cached_skills:
-            print("    Using cached skills.json")
-            world_data['skills'] = cached_skills
+            # Step 10: Generate or load level progression requirements
+            print("  [10/10] Level progression requirements...")
+            cached_progression = self._load_cached("level_progression.json")
+            if cached_progression:
+                print("    Using cached level_progression.json")
+                world_data['level_progression'] = cached_progression
+            else:
+                print("    Generating level progression requirements...")
+                progression_gen = LevelProgressionGenerator(
+                    embedder=self.embedder,
+                    target_language=self.target_language,
+                    native_language=self.native_language,
+                    output_path=self.output_path
+                )
+                world_data['level_progression'] = progression_gen.generate(
+                    world_data['skills']
+                )
+
+            world_data['games'] = games_future.result()
+
+        BaseGenerator.flush_writes()
+        print("  World generation complete!")
+        return world_data
+
+    def _generate_npcs(self, world_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 3: Generate or load NPCs."""
+        print("  [3/10] NPCs...")
+        cached_npcs = self._load_cached("npcs.json")
+        if cached_npcs:
+            print("    Using cached npcs.json")
+            return cached_npcs
         else:
-            print("    Generating language skills...")
-            # Get grammar curriculum from tutor data
-            grammar_curriculum = world_data['tutor'].get('grammar_by_level', {})
-            skill_gen = SkillGenerator(
+            print("    Generating NPCs...")
+            npc_gen = NPCGenerator(
                 embedder=self.embedder,
                 target_language=self.target_language,
                 native_language=self.native_language,
                 output_path=self.output_path
             )
-            world_data['skills'] = skill_gen.generate(
-                world_data['lore'],
-                grammar_curriculum
-            )
+            return npc_gen.generate(world_data['lore'], world_data['map'])
 
-        # Step 9: Generate or load skill progression triggers
-        print("  [9/10] Skill progression triggers...")
-        cached_triggers = self._load_cached("triggers.json")
-        if cached_triggers:
-            print("    Using cached triggers.json")
-            world_data['triggers'] = cached_triggers
+    def _generate_items(self, world_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 4: Generate or load items."""
+        print("  [4/10] Items...")
+        cached_items = self._load_cached("items.json")
+        if cached_items:
+            print("    Using cached items.json")
+            return cached_items
         else:
-            print("    Generating skill progression triggers...")
-            trigger_gen = TriggerGenerator(
+            print("    Generating items...")
+            item_gen = ItemGenerator(
                 embedder=self.embedder,
                 target_language=self.target_language,
                 native_language=self.native_language,
                 output_path=self.output_path
             )
-            world_data['triggers'] = trigger_gen.generate(
-                world_data['skills'],
-                world_data['quests'],
-                world_data['npcs'],
-            )
+            return item_gen.generate(world_data['lore'], world_data['map'])
 
-        # Step 10: Generate or load level progression requirements
-        print("  [10/10] Level progression requirements...")
-        cached_progression = self._load_cached("level_progression.json")
-        if cached_progression:
-            print("    Using cached level_progression.json")
-            world_data['level_progression'] = cached_progression
+    @staticmethod
+    def _report_games_failure(future: Future) -> None:
+        """Report a failed mini-game step as soon as it happens, not after step 10."""
+        error = future.exception()
+        if error is not None:
+            print(f"  [6/10] Mini-games failed: {error}")
+
+    def _generate_games(self, world_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Step 6: Generate or load mini-games."""
+        print("  [6/10] Mini-games...")
+        cached_games = self._load_cached("games.json")
+        if cached_games:
+            print("    Using cached games.json")
+            return cached_games
         else:
-            print("    Generating level progression requirements...")
-            progression_gen = LevelProgressionGenerator(
+            print("    Generating mini-games...")
+            game_gen = GameGenerator(
                 embedder=self.embedder,
                 target_language=self.target_language,
                 native_language=self.native_language,
-                output_path=self.output_path
+                output_path=self.output_path,
+                use_batch_api=self.use_batch_api,
+                use_response_cache=self.use_response_cache
             )
-            world_data['level_progression'] = progression_gen.generate(
-                world_data['skills']
+            return game_gen.generate(
+                world_data['map'],
+                world_data['npcs'],
+                world_data['items'],
+                world_data['quests']
             )
-
-        print("  World generation complete!")
-        return world_data
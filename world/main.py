@@ -7,6 +7,7 @@ from absolute zero (A0) to A2 fluency level.
 """
 
 import argparse
+import logging
 import re
 import shutil
 import sys
@@ -58,6 +59,16 @@ def parse_arguments():
         action="store_true",
         help="Force rebuild embeddings even if they exist (only with -d)"
     )
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Generate game code through the OpenAI Batch API (half price, may take hours)"
+    )
+    parser.add_argument(
+        "--cache-responses",
+        action="store_true",
+        help="Reuse earlier game responses to identical prompts from ~/.cache/vocari"
+    )
     return parser.parse_args()
 
 
@@ -101,6 +112,9 @@ def get_next_version_path(base_output: Path, native_lang: str, target_lang: str)
 def main():
     args = parse_arguments()
 
+    # Generator progress goes through logging; keep it on stdout, in line with the prints
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     # Create versioned output directory structure
     base_output = Path(args.output)
     version_path = get_next_version_path(
@@ -151,12 +165,13 @@ def main():
             sys.exit(1)
 
         # Check for required embedding files
-        embeddings_file = embed_path / "embeddings.pkl"
+        embeddings_file = embed_path / "embeddings.npy"
+        chunks_file = embed_path / "chunks.json"
         metadata_file = embed_path / "embeddings_metadata.json"
 
-        if not embeddings_file.exists() or not metadata_file.exists():
-            print("Error: Embeddings directory must contain 'embeddings.pkl' and 'embeddings_metadata.json'")
-            print(f"  Found: {list(embed_path.glob('*.pkl'))} and {list(embed_path.glob('*.json'))}")
+        if not embeddings_file.exists() or not chunks_file.exists() or not metadata_file.exists():
+            print("Error: Embeddings directory must contain 'embeddings.npy', 'chunks.json' and 'embeddings_metadata.json'")
+            print(f"  Found: {list(embed_path.glob('*.npy'))} and {list(embed_path.glob('*.json'))}")
             sys.exit(1)
 
         print(f"Embeddings: {args.embeddings}")
@@ -165,7 +180,8 @@ def main():
 
         # Step 1: Copy embeddings to new version directory
         print("Step 1: Copying existing embeddings...")
-        shutil.copy(embeddings_file, version_path / "embeddings.pkl")
+        shutil.copy(embeddings_file, version_path / "embeddings.npy")
+        shutil.copy(chunks_file, version_path / "chunks.json")
         shutil.copy(metadata_file, version_path / "embeddings_metadata.json")
 
         # Load the embedder from the copied files
@@ -185,7 +201,9 @@ def main():
         embedder=embedder,
         target_language=args.target_language,
         native_language=args.native_language,
-        output_path=version_path
+        output_path=version_path,
+        use_batch_api=args.batch_api,
+        use_response_cache=args.cache_responses
     )
     orchestrator.generate()
     print()
@@ -0,0 +1,131 @@
+"""
+Tests for BaseGenerator.validate_bilingual_text
+
+The validator walks the document iteratively and only renders paths for
+errors. These tests pin it to the original recursive implementation:
+1. Same errors, in the same order, for hand-written and random documents
+2. max_errors returns a prefix of the full error list
+3. Nesting deeper than the recursion limit is handled
+"""
+
+import random
+import sys
+
+import pytest
+from generators.base_generator import BaseGenerator
+
+
+def reference_validate_bilingual_text(obj, path=""):
+    """The original recursive implementation."""
+    errors = []
+
+    if isinstance(obj, dict):
+        if "native_language" in obj and "target_language" in obj:
+            if not isinstance(obj["native_language"], str):
+                errors.append(f"{path}.native_language is not a string")
+            if not isinstance(obj["target_language"], str):
+                errors.append(f"{path}.target_language is not a string")
+        else:
+            for key, value in obj.items():
+                errors.extend(reference_validate_bilingual_text(value, f"{path}.{key}"))
+
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            errors.extend(reference_validate_bilingual_text(item, f"{path}[{i}]"))
+
+    return errors
+
+
+def random_document(rng, depth=0):
+    """Random JSON-like tree mixing valid and broken bilingual text objects."""
+    roll = rng.random()
+    if depth >= 5 or roll < 0.2:
+        return rng.choice(["text", 3, None, True, 2.5])
+    if roll < 0.45:
+        return {
+            "native_language": rng.choice(["hello", 1, None, ["x"]]),
+            "target_language": rng.choice(["hola", 2, {"a": 1}]),
+        }
+    if roll < 0.75:
+        return {f"k{i}": random_document(rng, depth + 1) for i in range(rng.randint(0, 4))}
+    return [random_document(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+# === Test Fixtures ===
+
+@pytest.fixture
+def generator():
+    """A generator without an API client; validation does not need one."""
+    return BaseGenerator.__new__(BaseGenerator)
+
+
+@pytest.fixture
+def quest_document():
+    """A quest-shaped document with a few broken text fields."""
+    return {
+        "name": {"native_language": "The Lost Herb", "target_language": "La hierba perdida"},
+        "description": {"native_language": 42, "target_language": None},
+        "objectives": [
+            {"text": {"native_language": "Find it", "target_language": "Encuéntrala"}},
+            {"text": {"native_language": ["Ask"], "target_language": "Pregunta"}},
+            {"hints": [[{"native_language": "a", "target_language": 7}]]},
+        ],
+        "reward": {"gold": 10, "item": {"native_language": None, "target_language": "x"}},
+        "partial": {"native_language": 1},
+    }
+
+
+# === Equivalence Tests ===
+
+class TestMatchesRecursiveImplementation:
+    """The iterative walk reports exactly what the recursive one did."""
+
+    def test_quest_document(self, generator, quest_document):
+        expected = reference_validate_bilingual_text(quest_document)
+        assert len(expected) == 5
+        assert generator.validate_bilingual_text(quest_document) == expected
+
+    def test_path_prefix(self, generator, quest_document):
+        expected = reference_validate_bilingual_text(quest_document, "quests[3]")
+        assert generator.validate_bilingual_text(quest_document, "quests[3]") == expected
+
+    @pytest.mark.parametrize("obj", [{}, [], "text", None, {"native_language": "a", "target_language": "b"}])
+    def test_trivial_inputs(self, generator, obj):
+        assert generator.validate_bilingual_text(obj) == reference_validate_bilingual_text(obj)
+
+    def test_random_documents(self, generator):
+        rng = random.Random(7)
+        for _ in range(500):
+            document = random_document(rng)
+            assert generator.validate_bilingual_text(document) == reference_validate_bilingual_text(document)
+
+
+class TestMaxErrors:
+    """max_errors stops the walk early without changing what is reported."""
+
+    @pytest.mark.parametrize("max_errors", [1, 2, 4, 5, 10])
+    def test_prefix_of_full_list(self, generator, quest_document, max_errors):
+        expected = reference_validate_bilingual_text(quest_document)[:max_errors]
+        assert generator.validate_bilingual_text(quest_document, max_errors=max_errors) == expected
+
+    def test_random_documents(self, generator):
+        rng = random.Random(11)
+        for _ in range(200):
+            document = random_document(rng)
+            max_errors = rng.randint(1, 3)
+            expected = reference_validate_bilingual_text(document)[:max_errors]
+            assert generator.validate_bilingual_text(document, max_errors=max_errors) == expected
+
+
+class TestDeepNesting:
+    """The iterative walk is not bound by the recursion limit."""
+
+    def test_deeper_than_recursion_limit(self, generator):
+        depth = sys.getrecursionlimit() + 100
+        document = {"native_language": 1, "target_language": "x"}
+        for _ in range(depth):
+            document = [document]
+
+        errors = generator.validate_bilingual_text(document)
+
+        assert errors == ["[0]" * depth + ".native_language is not a string"]
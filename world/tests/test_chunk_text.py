@@ -0,0 +1,88 @@
+"""
+Tests for DocumentEmbedder._chunk_text
+
+Chunk break points are found by bisecting a precomputed list of boundaries.
+These tests pin the chunks, including their offsets, to the original
+implementation that ran rfind() over each chunk-sized window.
+"""
+
+import random
+
+import pytest
+from embeddings import DocumentEmbedder
+
+
+def reference_chunk_text(text, source, chunk_size, chunk_overlap):
+    """The original rfind()-based implementation."""
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+        chunk_text = text[start:end]
+
+        if end < len(text):
+            last_period = chunk_text.rfind('.')
+            last_newline = chunk_text.rfind('\n')
+            break_point = max(last_period, last_newline)
+            if break_point > chunk_size // 2:
+                chunk_text = chunk_text[:break_point + 1]
+                end = start + break_point + 1
+
+        if chunk_text.strip():
+            chunks.append({
+                'text': chunk_text.strip(),
+                'source': source,
+                'start_char': start,
+                'end_char': end
+            })
+
+        start = end - chunk_overlap
+
+    return chunks
+
+
+def random_text(rng, length):
+    """Random prose-like text with sentence ends, newlines and blank runs."""
+    alphabet = "abcde fghij " * 4 + ".\n" + "   "
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+# === Test Fixtures ===
+
+@pytest.fixture
+def embedder():
+    """An embedder without an API client; chunking does not need one."""
+    return DocumentEmbedder.__new__(DocumentEmbedder)
+
+
+# === Equivalence Tests ===
+
+class TestMatchesRfindImplementation:
+    """Bisecting the boundary list yields exactly the old chunks."""
+
+    def test_default_sizes(self, embedder):
+        rng = random.Random(3)
+        text = random_text(rng, 20 * DocumentEmbedder.CHUNK_SIZE)
+        expected = reference_chunk_text(
+            text, "doc.md", DocumentEmbedder.CHUNK_SIZE, DocumentEmbedder.CHUNK_OVERLAP
+        )
+        assert len(expected) > 20
+        assert embedder._chunk_text(text, "doc.md") == expected
+
+    @pytest.mark.parametrize("chunk_size,chunk_overlap", [(10, 0), (20, 5), (50, 10), (64, 31)])
+    def test_random_texts(self, embedder, chunk_size, chunk_overlap):
+        embedder.CHUNK_SIZE = chunk_size
+        embedder.CHUNK_OVERLAP = chunk_overlap
+        rng = random.Random(chunk_size)
+        for _ in range(200):
+            text = random_text(rng, rng.randint(0, 8 * chunk_size))
+            expected = reference_chunk_text(text, "doc.txt", chunk_size, chunk_overlap)
+            assert embedder._chunk_text(text, "doc.txt") == expected
+
+    @pytest.mark.parametrize("text", ["", "   ", "no boundaries at all " * 100, "." * 3000, "\n" * 3000])
+    def test_edge_cases(self, embedder, text):
+        expected = reference_chunk_text(
+            text, "doc.txt", DocumentEmbedder.CHUNK_SIZE, DocumentEmbedder.CHUNK_OVERLAP
+        )
+        assert embedder._chunk_text(text, "doc.txt") == expected
@@ -0,0 +1,112 @@
+"""
+Tests for LevelProgressionEvaluator.can_advance_batch
+
+The batch check must agree with calling can_advance() once per user, for
+random requirements covering:
+1. Core skills and flexible pool skills with no column in the matrix
+2. Zero thresholds, zero flexible counts and levels with no requirement
+3. Empty batches and matrices with no columns
+
+Every test runs once per backend: the NumPy reductions, the row kernel as
+plain Python and, when Numba is installed, the compiled kernel.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from generators import level_progression
+from generators.level_progression import LevelProgressionEvaluator
+from generators.models import (
+    LevelProgressionRequirement,
+    LevelProgressionConfig,
+    SkillThreshold,
+    LanguageLevel,
+)
+
+
+SKILL_IDS = [f"skill_{i}" for i in range(30)]
+# Referenced by requirements but never given a column
+MISSING_SKILL_IDS = ["skill_missing_a", "skill_missing_b"]
+
+
+def random_requirement(rng, from_level, to_level):
+    """A requirement mixing present, missing and zero-threshold skills."""
+    pool = SKILL_IDS + MISSING_SKILL_IDS
+    return LevelProgressionRequirement(
+        from_level=from_level,
+        to_level=to_level,
+        minimum_total_skill_points=rng.randint(0, 800),
+        required_skill_thresholds=[
+            SkillThreshold(skill_id=rng.choice(pool), minimum_level=rng.choice([0, 10, 30, 60]))
+            for _ in range(rng.randint(0, 5))
+        ],
+        flexible_skill_pool=[rng.choice(pool) for _ in range(rng.randint(0, 8))],
+        flexible_skill_count=rng.randint(0, 4),
+        flexible_threshold=rng.choice([0, 20, 50]),
+    )
+
+
+def random_evaluator(rng):
+    """An evaluator with requirements for A0 and A1 only."""
+    return LevelProgressionEvaluator(LevelProgressionConfig(requirements=[
+        random_requirement(rng, LanguageLevel.A0, LanguageLevel.A0_PLUS),
+        random_requirement(rng, LanguageLevel.A1, LanguageLevel.A1_PLUS),
+    ]))
+
+
+def expected_batch(evaluator, level, skill_ids, skill_matrix):
+    """can_advance() for each row, as the batch check must report it."""
+    return [
+        evaluator.can_advance(level, dict(zip(skill_ids, map(int, row))))[0]
+        for row in skill_matrix
+    ]
+
+
+# === Test Fixtures ===
+
+@pytest.fixture(params=["numpy", "python", "numba"])
+def batch_backend(request, monkeypatch):
+    """Force can_advance_batch onto one backend."""
+    if request.param == "numpy":
+        monkeypatch.setattr(level_progression, "_can_advance_kernel", None)
+    elif request.param == "python":
+        monkeypatch.setattr(level_progression, "_can_advance_kernel", level_progression._can_advance_rows)
+    elif level_progression._can_advance_kernel is None:
+        pytest.skip("numba is not installed")
+    return request.param
+
+
+# === Equivalence Tests ===
+
+@pytest.mark.usefixtures("batch_backend")
+class TestCanAdvanceBatch:
+    """can_advance_batch matches a can_advance() call per user, on every backend."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_requirements(self, seed):
+        rng = random.Random(seed)
+        np_rng = np.random.default_rng(seed)
+        for _ in range(60):
+            evaluator = random_evaluator(rng)
+            skill_ids = rng.sample(SKILL_IDS, rng.randint(0, len(SKILL_IDS)))
+            skill_matrix = np_rng.integers(0, 101, size=(20, len(skill_ids)))
+            for level in (LanguageLevel.A0, LanguageLevel.A1, LanguageLevel.A2):
+                result = evaluator.can_advance_batch(level, skill_ids, skill_matrix)
+                assert result.dtype == np.bool_
+                assert list(result) == expected_batch(evaluator, level, skill_ids, skill_matrix)
+
+    def test_empty_batch(self):
+        evaluator = random_evaluator(random.Random(0))
+        result = evaluator.can_advance_batch(
+            LanguageLevel.A0, SKILL_IDS, np.zeros((0, len(SKILL_IDS)), dtype=np.int64)
+        )
+        assert result.shape == (0,)
+
+    def test_level_without_requirement(self):
+        evaluator = random_evaluator(random.Random(0))
+        result = evaluator.can_advance_batch(
+            LanguageLevel.A2, SKILL_IDS, np.full((3, len(SKILL_IDS)), 100)
+        )
+        assert not result.any()
+
@@ -0,0 +1,124 @@
+"""
+Tests for BaseGenerator._repair_truncated_json
+
+The last-complete-item scan uses a regex that skips whole strings instead
+of walking the response one character at a time. These tests pin the
+repair to the original character loop for every truncation point of
+responses with escapes, brackets inside strings and nested items.
+"""
+
+import json
+
+import orjson
+import pytest
+from generators.base_generator import BaseGenerator
+
+
+def reference_repair_truncated_json(response):
+    """The original character-loop implementation."""
+    if not response:
+        return None
+
+    try:
+        return orjson.loads(response)
+    except json.JSONDecodeError:
+        pass
+
+    open_braces = response.count('{') - response.count('}')
+    open_brackets = response.count('[') - response.count(']')
+
+    repaired = response.rstrip()
+    if repaired.endswith(','):
+        repaired = repaired[:-1]
+    repaired += ']' * open_brackets
+    repaired += '}' * open_braces
+
+    try:
+        return orjson.loads(repaired)
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        depth = 0
+        last_complete = 0
+        in_string = False
+        escape_next = False
+
+        for i, char in enumerate(response):
+            if escape_next:
+                escape_next = False
+                continue
+            if char == '\\':
+                escape_next = True
+                continue
+            if char == '"' and not escape_next:
+                in_string = not in_string
+                continue
+            if in_string:
+                continue
+
+            if char in '{[':
+                depth += 1
+            elif char in '}]':
+                depth -= 1
+                if depth == 1:
+                    last_complete = i + 1
+
+        if last_complete > 0:
+            truncated = response[:last_complete]
+            remaining_braces = truncated.count('{') - truncated.count('}')
+            remaining_brackets = truncated.count('[') - truncated.count(']')
+            truncated += ']' * remaining_brackets
+            truncated += '}' * remaining_braces
+            return orjson.loads(truncated)
+    except (json.JSONDecodeError, Exception):
+        pass
+
+    return None
+
+
+# Complete responses; every prefix of each is tried as a truncated response
+RESPONSES = [
+    '{"quests": [{"id": "q1", "name": "Herbs"}, {"id": "q2", "name": "Bread"}]}',
+    '{"items": [{"name": "a \\"quoted\\" [word]", "tags": ["x", "{y}"]}, {"name": "b\\\\"}, {"n": 3}]}',
+    '[{"a": [1, 2, {"b": "}]"}]}, {"c": "\\u00e9t\\u00e9"}, [3, [4, 5]], {"d": null}]',
+    '{"npcs": [{"dialogue": ["Hola, \\"amigo\\"!", "Adi\\u00f3s"]}, {"dialogue": []}], "count": 2}',
+    '{"text": "escaped backslash at end \\\\", "list": [{"k": "v"}, {"k": "w"}]}',
+]
+
+
+# === Test Fixtures ===
+
+@pytest.fixture
+def generator():
+    """A generator without an API client; the repair does not need one."""
+    return BaseGenerator.__new__(BaseGenerator)
+
+
+# === Equivalence Tests ===
+
+class TestMatchesCharacterLoop:
+    """The regex scan repairs every truncation exactly like the old loop."""
+
+    @pytest.mark.parametrize("response", RESPONSES)
+    def test_every_truncation_point(self, generator, response):
+        assert orjson.loads(response) is not None
+        for length in range(len(response) + 1):
+            truncated = response[:length]
+            expected = reference_repair_truncated_json(truncated)
+            assert generator._repair_truncated_json(truncated) == expected, truncated
+
+    @pytest.mark.parametrize("response", [
+        '{"a": [{"b": 1}, {"c": 2}], ',
+        '{"a": [{"b": 1}, {"c": 2}],\n  ',
+        '\\{"a": [{"b": 1}, {"c": "x',
+        '{"a": [{"b": "\\\\"}, {"c": "\\"',
+        'not json at all',
+        '}}]]',
+    ])
+    def test_irregular_responses(self, generator, response):
+        assert generator._repair_truncated_json(response) == reference_repair_truncated_json(response)
+
+    def test_recovers_complete_items(self, generator):
+        response = '[{"id": "q1", "name": "Herbs"}, {"id": "q2", "name": "Br'
+        assert generator._repair_truncated_json(response) == [{"id": "q1", "name": "Herbs"}]